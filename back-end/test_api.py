@@ -7,6 +7,8 @@ Teste tous les endpoints d'authentification
 import requests
 import json
 import sys
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Configuration
 BASE_URL = "http://localhost:8000/api/auth"
@@ -15,6 +17,16 @@ HEADERS = {
     'Accept': 'application/json'
 }
 
+# Délais (connexion, lecture) : un serveur arrêté ou bloqué fait échouer vite
+TIMEOUT = (1.0, 5.0)
+
+# Session partagée : connexions keep-alive réutilisées par tous les appels,
+# nouvelles tentatives sur les erreurs transitoires uniquement
+RETRY = Retry(total=3, connect=2, read=2, backoff_factor=0.2,
+              status_forcelist=(502, 503, 504), raise_on_status=False)
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=RETRY))
+
 def print_response(title, response):
     """Affiche la réponse de manière formatée"""
     print(f"\n{'='*50}")
@@ -24,7 +36,7 @@ def print_response(title, response):
     print(f"Headers: {dict(response.headers)}")
     try:
         print(f"Response: {json.dumps(response.json(), indent=2, ensure_ascii=False)}")
-    except:
+    except ValueError:
         print(f"Response: {response.text}")
 
 def test_api():
@@ -47,9 +59,10 @@ def test_api():
         "role": "user"
     }
     
-    response = requests.post(f"{BASE_URL}/register/", 
-                           headers=HEADERS, 
-                           json=registration_data)
+    response = SESSION.post(f"{BASE_URL}/register/", 
+                          headers=HEADERS, 
+                          json=registration_data,
+                          timeout=TIMEOUT)
     print_response("Inscription utilisateur", response)
     
     if response.status_code == 201:
@@ -70,9 +83,10 @@ def test_api():
         "password": "TestPassword123!"
     }
     
-    response = requests.post(f"{BASE_URL}/login/", 
-                           headers=HEADERS, 
-                           json=login_data)
+    response = SESSION.post(f"{BASE_URL}/login/", 
+                          headers=HEADERS, 
+                          json=login_data,
+                          timeout=TIMEOUT)
     print_response("Connexion utilisateur", response)
     
     if response.status_code == 200:
@@ -91,7 +105,7 @@ def test_api():
     
     # 3. Test de récupération du profil
     print("\n3️⃣ Test de récupération du profil")
-    response = requests.get(f"{BASE_URL}/profile/", headers=auth_headers)
+    response = SESSION.get(f"{BASE_URL}/profile/", headers=auth_headers, timeout=TIMEOUT)
     print_response("Profil utilisateur", response)
     
     # 4. Test de mise à jour du profil
@@ -103,14 +117,15 @@ def test_api():
         "organization": "DIP Updated Organization"
     }
     
-    response = requests.put(f"{BASE_URL}/profile/update/", 
-                          headers=auth_headers, 
-                          json=update_data)
+    response = SESSION.put(f"{BASE_URL}/profile/update/", 
+                         headers=auth_headers, 
+                         json=update_data,
+                         timeout=TIMEOUT)
     print_response("Mise à jour profil", response)
     
     # 5. Test de récupération des détails du profil
     print("\n5️⃣ Test de récupération des détails du profil")
-    response = requests.get(f"{BASE_URL}/profile/details/", headers=auth_headers)
+    response = SESSION.get(f"{BASE_URL}/profile/details/", headers=auth_headers, timeout=TIMEOUT)
     print_response("Détails profil", response)
     
     # 6. Test de mise à jour des détails du profil
@@ -125,9 +140,10 @@ def test_api():
         "monthly_reports": False
     }
     
-    response = requests.put(f"{BASE_URL}/profile/details/update/", 
-                          headers=auth_headers, 
-                          json=profile_update_data)
+    response = SESSION.put(f"{BASE_URL}/profile/details/update/", 
+                         headers=auth_headers, 
+                         json=profile_update_data,
+                         timeout=TIMEOUT)
     print_response("Mise à jour détails profil", response)
     
     # 7. Test de changement de mot de passe
@@ -138,9 +154,10 @@ def test_api():
         "new_password_confirm": "NewTestPassword123!"
     }
     
-    response = requests.post(f"{BASE_URL}/change-password/", 
-                          headers=auth_headers, 
-                          json=password_data)
+    response = SESSION.post(f"{BASE_URL}/change-password/", 
+                         headers=auth_headers, 
+                         json=password_data,
+                         timeout=TIMEOUT)
     print_response("Changement de mot de passe", response)
     
     # 8. Test de rafraîchissement du token
@@ -149,9 +166,10 @@ def test_api():
         "refresh": refresh_token
     }
     
-    response = requests.post(f"{BASE_URL}/token/refresh/", 
-                          headers=HEADERS, 
-                          json=refresh_data)
+    response = SESSION.post(f"{BASE_URL}/token/refresh/", 
+                         headers=HEADERS, 
+                         json=refresh_data,
+                         timeout=TIMEOUT)
     print_response("Rafraîchissement token", response)
     
     if response.status_code == 200:
@@ -165,7 +183,7 @@ def test_api():
     
     # 9. Test de récupération de l'historique des connexions
     print("\n9️⃣ Test de récupération de l'historique des connexions")
-    response = requests.get(f"{BASE_URL}/login-history/", headers=auth_headers)
+    response = SESSION.get(f"{BASE_URL}/login-history/", headers=auth_headers, timeout=TIMEOUT)
     print_response("Historique des connexions", response)
     
     # 10. Test de déconnexion
@@ -174,9 +192,10 @@ def test_api():
         "refresh_token": refresh_token
     }
     
-    response = requests.post(f"{BASE_URL}/logout/", 
-                          headers=auth_headers, 
-                          json=logout_data)
+    response = SESSION.post(f"{BASE_URL}/logout/", 
+                         headers=auth_headers, 
+                         json=logout_data,
+                         timeout=TIMEOUT)
     print_response("Déconnexion", response)
     
     # 11. Test avec des données invalides
@@ -186,9 +205,10 @@ def test_api():
         "password": "WrongPassword"
     }
     
-    response = requests.post(f"{BASE_URL}/login/", 
-                          headers=HEADERS, 
-                          json=invalid_login_data)
+    response = SESSION.post(f"{BASE_URL}/login/", 
+                         headers=HEADERS, 
+                         json=invalid_login_data,
+                         timeout=TIMEOUT)
     print_response("Connexion avec mot de passe incorrect", response)
     
     print("\n" + "="*60)
@@ -198,7 +218,7 @@ def test_api():
 if __name__ == "__main__":
     try:
         test_api()
-    except requests.exceptions.ConnectionError:
+    except (requests.ConnectionError, requests.Timeout):
         print("❌ Erreur de connexion. Assurez-vous que le serveur Django est démarré sur le port 8001.")
         print("💡 Commande: python manage.py runserver 0.0.0.0:8001")
         sys.exit(1)
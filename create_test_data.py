@@ -1,28 +1,82 @@
-import pandas as pd
-import numpy as np
-
-# Créer des données de test
-np.random.seed(42)
-data = {
-    'ID': range(1, 101),
-    'Age': np.random.normal(35, 10, 100),
-    'Salary': np.random.normal(50000, 15000, 100),
-    'Department': np.random.choice(['IT', 'HR', 'Finance', 'Marketing'], 100),
-    'Experience': np.random.normal(5, 3, 100),
-    'Date': pd.date_range('2023-01-01', periods=100, freq='D')
-}
-
-# Ajouter quelques outliers
-data['Salary'][10] = 150000  # Outlier
-data['Age'][20] = 80  # Outlier
-
-# Ajouter quelques valeurs manquantes
-data['Age'][5] = np.nan
-data['Salary'][15] = np.nan
-
-df = pd.DataFrame(data)
-df.to_csv('/tmp/test_data.csv', index=False)
-print("Fichier de test créé: /tmp/test_data.csv")
-print(f"Shape: {df.shape}")
-print(f"Colonnes: {df.columns.tolist()}")
-print(f"Valeurs manquantes: {df.isnull().sum().sum()}")
+import functools
+import hashlib
+import io
+import os
+import tempfile
+from pathlib import Path
+
+TEST_DATA_SIZE = 100
+SEED = 42
+
+# CSV mémorisé sur disque, clé : générateur + taille + graine (pas de régénération entre deux exécutions)
+FIXTURE_PATH = Path(f"/tmp/dip_test_fixture_pcg64_{TEST_DATA_SIZE}_{SEED}.csv")
+# Empreinte SHA-256 du CSV : un fichier tronqué ou en cours d'écriture n'est pas réutilisé
+DIGEST_PATH = FIXTURE_PATH.with_name(FIXTURE_PATH.name + ".sha256")
+
+def build_test_data(size=TEST_DATA_SIZE, seed=SEED):
+    """Créer des données de test"""
+    import pandas as pd
+    import numpy as np
+
+    # Générateur PCG64 et dates numpy : pas d'inférence de types pandas colonne par colonne
+    rng = np.random.default_rng(seed)
+    data = {
+        'ID': np.arange(1, size + 1),
+        'Age': rng.normal(35, 10, size),
+        'Salary': rng.normal(50000, 15000, size),
+        'Department': rng.choice(['IT', 'HR', 'Finance', 'Marketing'], size),
+        'Experience': rng.normal(5, 3, size),
+        'Date': np.datetime64('2023-01-01', 'D') + np.arange(size)
+    }
+
+    # Ajouter quelques outliers
+    data['Salary'][10] = 150000  # Outlier
+    data['Age'][20] = 80  # Outlier
+
+    # Ajouter quelques valeurs manquantes
+    data['Age'][5] = np.nan
+    data['Salary'][15] = np.nan
+
+    return pd.DataFrame(data)
+
+def _write_atomic(path, content: bytes):
+    """Écrit dans un fichier temporaire du même répertoire puis le renomme (os.replace)"""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def _read_cached():
+    """CSV mémorisé, ou None s'il manque ou ne correspond pas à son empreinte"""
+    try:
+        content = FIXTURE_PATH.read_bytes()
+        digest = DIGEST_PATH.read_text().strip()
+    except OSError:
+        return None
+    return content if hashlib.sha256(content).hexdigest() == digest else None
+
+@functools.lru_cache(maxsize=1)
+def test_csv_bytes() -> bytes:
+    """Contenu CSV des données de test (généré une seule fois, puis relu depuis le disque)"""
+    content = _read_cached()
+    if content is not None:
+        return content
+    content = build_test_data().to_csv(index=False).encode()
+    _write_atomic(FIXTURE_PATH, content)
+    _write_atomic(DIGEST_PATH, hashlib.sha256(content).hexdigest().encode())
+    return content
+
+if __name__ == "__main__":
+    import pandas as pd
+
+    content = test_csv_bytes()
+    Path('/tmp/test_data.csv').write_bytes(content)
+    df = pd.read_csv(io.BytesIO(content))
+    print("Fichier de test créé: /tmp/test_data.csv")
+    print(f"Shape: {df.shape}")
+    print(f"Colonnes: {df.columns.tolist()}")
+    print(f"Valeurs manquantes: {df.isnull().sum().sum()}")
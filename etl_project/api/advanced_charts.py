@@ -49,6 +49,7 @@ class AdvancedChartGenerator:
             return {
                 'success': True,
                 'chart_type': chart_type,
+                'title': final_config['title'],
                 'config': final_config,
                 'data': chart_data,
                 'metadata': {
@@ -34,7 +34,7 @@ class AdvancedDataProcessor:
                 'rows': len(data),
                 'columns': len(data.columns),
                 'missing_values': data.isnull().sum().to_dict(),
-                'data_types': data.dtypes.to_dict()
+                'data_types': data.dtypes.astype(str).to_dict()
             }
             
             # Détection d'inconsistances basiques
@@ -43,7 +43,9 @@ class AdvancedDataProcessor:
             # Corrélations
             numeric_cols = data.select_dtypes(include=[np.number]).columns
             if len(numeric_cols) > 1:
-                self.correlations = data[numeric_cols].corr().to_dict()
+                # Colonnes constantes : corrélation NaN, non sérialisable en JSON
+                correlations = data[numeric_cols].corr()
+                self.correlations = correlations.astype(object).where(correlations.notna(), None).to_dict()
             
             # Insights basiques
             self.insights = self._generate_insights(data)
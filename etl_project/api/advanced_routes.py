@@ -3,11 +3,13 @@ Script d'intégration des fonctionnalités avancées du projet DIP
 Connexion entre le frontend et le backend avec toutes les fonctionnalités du projet Asam237/dataviz
 """
 
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request, Response
 from fastapi.responses import HTMLResponse, FileResponse
 import pandas as pd
 import json
 import os
+import shutil
+import uuid
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 import logging
@@ -15,6 +17,7 @@ import logging
 # Import des modules avancés
 from .advanced_processor import AdvancedDataProcessor, process_file_advanced
 from .advanced_charts import AdvancedChartGenerator, create_chart_from_config
+from .http_cache import etag_matches
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
@@ -26,17 +29,32 @@ router = APIRouter(prefix="/api/advanced", tags=["Advanced Features"])
 # Stockage en mémoire pour les sessions (à remplacer par une base de données en production)
 sessions = {}
 
+# Les analyses d'une session ne changent plus après l'upload : réponses réutilisables
+SESSION_CACHE_CONTROL = "private, max-age=300"
+
+def _not_modified(request: Request, response: Response, session_id: str) -> Optional[Response]:
+    """
+    Ajoute ETag et Cache-Control ; retourne une réponse 304 si le client a déjà ces données
+    """
+    headers = {'ETag': sessions[session_id]['etag'], 'Cache-Control': SESSION_CACHE_CONTROL}
+    if etag_matches(request.headers.get('if-none-match', ''), headers['ETag']):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
 @router.post("/upload-advanced")
 async def upload_file_advanced(file: UploadFile = File(...)):
     """
     Upload de fichier avec traitement avancé et détection d'inconsistances
     """
     try:
-        # Sauvegarder le fichier temporairement
+        # Sauvegarder le fichier temporairement (copie par blocs, sans charger tout le contenu)
         temp_path = f"temp_{file.filename}"
-        with open(temp_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+        try:
+            with open(temp_path, "wb") as buffer:
+                shutil.copyfileobj(file.file, buffer)
+        finally:
+            await file.close()
         
         # Traiter le fichier avec le processeur avancé
         result = process_file_advanced(temp_path)
@@ -46,8 +64,10 @@ async def upload_file_advanced(file: UploadFile = File(...)):
         
         if result['success']:
             # Générer un ID de session
-            session_id = f"session_{len(sessions)}"
+            session_id = f"session_{uuid.uuid4().hex}"
             sessions[session_id] = {
+                # Identifiant unique des données
+                'etag': f'"{uuid.uuid4().hex}"',
                 'data_shape': result['data_shape'],
                 'inconsistencies': result['inconsistencies'],
                 'statistics': result['statistics'],
@@ -101,7 +121,7 @@ async def apply_corrections(session_id: str, corrections: Dict[str, List[Dict]])
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/analytics/{session_id}")
-async def get_analytics(session_id: str):
+async def get_analytics(session_id: str, request: Request, response: Response):
     """
     Récupère les analyses avancées pour une session
     """
@@ -109,6 +129,10 @@ async def get_analytics(session_id: str):
         if session_id not in sessions:
             raise HTTPException(status_code=404, detail="Session non trouvée")
         
+        not_modified = _not_modified(request, response, session_id)
+        if not_modified:
+            return not_modified
+        
         session = sessions[session_id]
         
         return {
@@ -123,6 +147,37 @@ async def get_analytics(session_id: str):
         logger.error(f"Erreur lors de la récupération des analytics: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _session_chart_data(session_id: str) -> pd.DataFrame:
+    """
+    Données utilisées pour les graphiques d'une session
+    """
+    # Pour l'exemple, on utilise des données simulées
+    # En production, vous devriez charger les vraies données de la session
+    import numpy as np
+    return pd.DataFrame({
+        'x': np.random.randn(100),
+        'y': np.random.randn(100),
+        'category': ['A', 'B', 'C'] * 33 + ['A']
+    })
+
+def _save_chart(session_id: str, chart_result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Sauvegarde un graphique dans la session et retourne sa description
+    """
+    if 'charts' not in sessions[session_id]:
+        sessions[session_id]['charts'] = {}
+    
+    chart_id = f"chart_{session_id}_{len(sessions[session_id]['charts'])}"
+    sessions[session_id]['charts'][chart_id] = chart_result
+    
+    return {
+        'success': True,
+        'chart_id': chart_id,
+        'chart_type': chart_result['chart_type'],
+        'title': chart_result['title'],
+        'html': chart_result.get('html')
+    }
+
 @router.post("/create-chart/{session_id}")
 async def create_chart(session_id: str, chart_config: Dict[str, Any]):
     """
@@ -132,36 +187,12 @@ async def create_chart(session_id: str, chart_config: Dict[str, Any]):
         if session_id not in sessions:
             raise HTTPException(status_code=404, detail="Session non trouvée")
         
-        # Pour l'exemple, on utilise des données simulées
-        # En production, vous devriez charger les vraies données de la session
-        
-        # Créer des données de test basées sur la configuration
-        import numpy as np
-        test_data = pd.DataFrame({
-            'x': np.random.randn(100),
-            'y': np.random.randn(100),
-            'category': ['A', 'B', 'C'] * 33 + ['A']
-        })
-        
         # Créer le graphique
-        chart_result = create_chart_from_config(test_data, chart_config)
+        chart_result = create_chart_from_config(_session_chart_data(session_id), chart_config)
         
         if chart_result['success']:
             # Sauvegarder le graphique
-            chart_id = f"chart_{session_id}_{len(sessions[session_id].get('charts', []))}"
-            
-            if 'charts' not in sessions[session_id]:
-                sessions[session_id]['charts'] = {}
-            
-            sessions[session_id]['charts'][chart_id] = chart_result
-            
-            return {
-                'success': True,
-                'chart_id': chart_id,
-                'chart_type': chart_result['chart_type'],
-                'title': chart_result['title'],
-                'html': chart_result['html']
-            }
+            return _save_chart(session_id, chart_result)
         else:
             raise HTTPException(status_code=400, detail=chart_result['error'])
             
@@ -169,6 +200,39 @@ async def create_chart(session_id: str, chart_config: Dict[str, Any]):
         logger.error(f"Erreur lors de la création du graphique: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/create-charts-batch/{session_id}")
+async def create_charts_batch(session_id: str, batch: Dict[str, List[Dict[str, Any]]]):
+    """
+    Crée plusieurs graphiques en une seule requête ({"charts": [config, ...]})
+    
+    Les données de la session sont chargées une seule fois pour tout le lot ;
+    un graphique en échec n'interrompt pas les suivants.
+    """
+    try:
+        if session_id not in sessions:
+            raise HTTPException(status_code=404, detail="Session non trouvée")
+        
+        data = _session_chart_data(session_id)
+        charts = []
+        for chart_config in batch.get('charts', []):
+            chart_result = create_chart_from_config(data, chart_config)
+            if chart_result['success']:
+                charts.append(_save_chart(session_id, chart_result))
+            else:
+                charts.append({'success': False, 'error': chart_result['error']})
+        
+        return {
+            'success': all(chart['success'] for chart in charts),
+            'charts': charts,
+            'total': len(charts)
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Erreur lors de la création des graphiques: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/chart/{session_id}/{chart_id}")
 async def get_chart(session_id: str, chart_id: str):
     """
@@ -266,7 +330,7 @@ async def export_chart(session_id: str, chart_id: str, format: str = "html"):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/recommendations/{session_id}")
-async def get_chart_recommendations(session_id: str):
+async def get_chart_recommendations(session_id: str, request: Request, response: Response):
     """
     Génère des recommandations de graphiques basées sur les données
     """
@@ -274,6 +338,10 @@ async def get_chart_recommendations(session_id: str):
         if session_id not in sessions:
             raise HTTPException(status_code=404, detail="Session non trouvée")
         
+        not_modified = _not_modified(request, response, session_id)
+        if not_modified:
+            return not_modified
+        
         session = sessions[session_id]
         
         # Générer des recommandations basées sur les métadonnées
@@ -8,6 +8,8 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+
 # Créer un router pour les endpoints de recherche de pays
 router = APIRouter(prefix="/search", tags=["country-search"])
 
@@ -23,7 +25,7 @@ async def search_country(q: str = Query(..., description="Code ou nom du pays"))
         dict: Informations géographiques du pays trouvé
     """
     try:
-        url = "https://nominatim.openstreetmap.org/search"
+        url = NOMINATIM_URL
         params = {
             "format": "json",
             "q": q,
@@ -103,7 +105,7 @@ async def search_countries(
         dict: Liste des pays trouvés
     """
     try:
-        url = "https://nominatim.openstreetmap.org/search"
+        url = NOMINATIM_URL
         params = {
             "format": "json",
             "q": q,
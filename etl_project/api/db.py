@@ -1,5 +1,5 @@
 import os
-from contextlib import contextmanager
+from contextlib import contextmanager, asynccontextmanager
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
@@ -24,3 +24,34 @@ def get_session():
         session.close()
 
 
+
+
+# Pilotes asynchrones correspondant aux URL synchrones
+ASYNC_DRIVERS = {
+    "sqlite://": "sqlite+aiosqlite://",
+    "postgresql://": "postgresql+asyncpg://",
+    "postgresql+psycopg2://": "postgresql+asyncpg://",
+}
+
+
+def get_async_database_url() -> str:
+    url = get_database_url()
+    for prefix, async_prefix in ASYNC_DRIVERS.items():
+        if url.startswith(prefix):
+            return async_prefix + url[len(prefix):]
+    return url
+
+
+_AsyncSessionLocal = None
+
+
+@asynccontextmanager
+async def get_async_session():
+    # Import et moteur créés à la demande : aiosqlite/asyncpg restent optionnels
+    global _AsyncSessionLocal
+    if _AsyncSessionLocal is None:
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+        engine = create_async_engine(get_async_database_url())
+        _AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+    async with _AsyncSessionLocal() as session:
+        yield session
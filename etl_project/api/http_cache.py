@@ -0,0 +1,6 @@
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Vrai si l'en-tête If-None-Match désigne etag (comparaison faible, préfixe W/ ignoré)."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in tags
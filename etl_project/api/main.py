@@ -1,8 +1,9 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse, FileResponse
+from fastapi.responses import JSONResponse, StreamingResponse, FileResponse, Response
 from typing import List, Optional
 import pandas as pd
+import hashlib
 import os
 import shutil
 import io
@@ -12,10 +13,11 @@ from .db import get_engine, get_session
 from .models import Base, UploadedFile, UploadedRow
 from .schemas import (
     FileMetadata, UploadResponse, PreviewResponse,
-    TransformPreviewRequest, TransformPreviewResponse
+    TransformPreviewRequest, TransformPreviewResponse, ProcessRequest
 )
 from .parsers import parse_file_and_preview, detect_type, read_preview
 from .advanced_routes import include_advanced_routes
+from .http_cache import etag_matches
 
 # ETL components
 from etl.transform.clean_data import DataCleaner
@@ -25,6 +27,7 @@ from utils.helpers import DataProfiler
 from etl.utils.names import NameStandardizer
 from etl.utils.name_clustering import cluster_by_threshold
 from etl.utils.text_processor import TextProcessor, MultiChoiceProcessor, apply_text_processing
+from scripts.process_file import process_file, InvalidProcessInput
 
 # Import logging
 from loguru import logger
@@ -91,16 +94,46 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Conditional GETs: ETag + If-None-Match turn unchanged responses into bodiless 304s.
+    # /files changes on upload/delete, so clients must always revalidate it.
+    etag_cache_control = {
+        "/docs": "max-age=60",
+        "/openapi.json": "max-age=60",
+        "/files": "no-cache",
+    }
+
+    @app.middleware("http")
+    async def conditional_get(request: Request, call_next):
+        response = await call_next(request)
+        cache_control = etag_cache_control.get(request.url.path)
+        if request.method != "GET" or cache_control is None or response.status_code != 200:
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        headers = {k: v for k, v in response.headers.items() if k not in ("content-length", "content-type")}
+        headers.update({"ETag": etag, "Cache-Control": cache_control})
+
+        if etag_matches(request.headers.get("if-none-match", ""), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, status_code=response.status_code,
+                        headers=headers, media_type=response.media_type or response.headers.get("content-type"))
+
     engine = get_engine()
     Base.metadata.create_all(engine)
     
     # Inclure les routes avancées
     include_advanced_routes(app)
 
-    upload_dir = os.path.join(os.path.dirname(__file__), "..", "uploads")
+    upload_dir = os.getenv("UPLOAD_DIR") or os.path.join(os.path.dirname(__file__), "..", "uploads")
     upload_dir = os.path.abspath(upload_dir)
     os.makedirs(upload_dir, exist_ok=True)
 
+    @app.api_route("/health", methods=["GET", "HEAD"])
+    def health():
+        # Cheap liveness probe for scripts and test fixtures (no Swagger rendering)
+        return {"ok": True}
+
     @app.post("/upload", response_model=UploadResponse)
     async def upload_file(file: UploadFile = File(...)):
         filename = file.filename or "uploaded_file"
@@ -341,6 +374,29 @@ def create_app() -> FastAPI:
                 logger.error(f"Erreur lors de la transformation du fichier {file_id}: {e}")
                 raise HTTPException(status_code=500, detail=f"Erreur de transformation: {str(e)}")
 
+    @app.post("/process")
+    def process_file_endpoint(body: ProcessRequest):
+        """Traite un fichier uploadé comme scripts/process_file.py, sans relancer Python à chaque appel"""
+        with get_session() as session:
+            uf = session.get(UploadedFile, body.file_id)
+            if not uf:
+                raise HTTPException(status_code=404, detail="File not found")
+            file_path = os.path.realpath(uf.stored_path)
+
+        # Only files stored under the upload directory may be processed
+        if os.path.commonpath([file_path, os.path.realpath(upload_dir)]) != os.path.realpath(upload_dir):
+            raise HTTPException(status_code=400, detail="File is outside the upload directory")
+
+        try:
+            return process_file(file_path, body.config)
+        except FileNotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        except InvalidProcessInput as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            logger.error(f"Erreur lors du traitement du fichier {file_path}: {e}")
+            raise HTTPException(status_code=500, detail=f"Erreur lors du traitement: {str(e)}")
+
     @app.get("/files/{file_id}/export-hybrid")
     def export_file_hybrid(file_id: int, format: str = "csv", options: dict = None):
         """Export d'un fichier transformé avec le HybridDataProcessor"""
@@ -1,7 +1,7 @@
 import os
 import pandas as pd
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from .schemas import FileMetadata, PreviewResponse
 
 
@@ -18,21 +18,31 @@ def detect_type(filename: str, content_type: str) -> str:
     raise ValueError("Unsupported file type")
 
 
-def read_preview(path: str, ftype: str) -> pd.DataFrame:
+def read_preview(path: str, ftype: str, dtype_backend: Optional[str] = None) -> pd.DataFrame:
+    # dtype_backend="pyarrow" : lecture CSV multi-thread et colonnes Arrow.
+    # Les transformations ETL comparent les dtypes à 'int64'/'float64',
+    # le défaut (numpy) reste donc requis pour le pipeline.
     if ftype == "csv":
+        if dtype_backend == "pyarrow":
+            return pd.read_csv(path, engine="pyarrow", dtype_backend="pyarrow")
+        if dtype_backend:
+            return pd.read_csv(path, dtype_backend=dtype_backend)
         return pd.read_csv(path)
     if ftype == "excel":
-        return pd.read_excel(path)
-    if ftype == "json":
+        df = pd.read_excel(path)
+    elif ftype == "json":
         with open(path, "r") as f:
             data = json.load(f)
         df = pd.json_normalize(data)
-        return df
-    if ftype == "geojson":
+    elif ftype == "geojson":
         import geopandas as gpd
         gdf = gpd.read_file(path)
-        return pd.DataFrame(gdf.drop(columns=gdf.geometry.name))
-    raise ValueError("Unsupported file type")
+        df = pd.DataFrame(gdf.drop(columns=gdf.geometry.name))
+    else:
+        raise ValueError("Unsupported file type")
+    if dtype_backend:
+        df = df.convert_dtypes(dtype_backend=dtype_backend)
+    return df
 
 
 def parse_file_and_preview(path: str, filename: str, content_type: str) -> PreviewResponse:
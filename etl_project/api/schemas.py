@@ -61,6 +61,11 @@ class TransformPreviewRequest(BaseModel):
     options: TransformOptions
 
 
+class ProcessRequest(BaseModel):
+    file_id: int
+    config: Dict[str, Any] = {}
+
+
 class TransformPreviewResponse(BaseModel):
     metadata: FileMetadata
     preview: List[Dict[str, Any]]
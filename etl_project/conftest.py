@@ -0,0 +1,91 @@
+"""
+Fixtures pytest partagées par les scripts de test de l'API
+
+Sans API_BASE_URL / UNIFIED_API_BASE_URL, chaque session pytest (donc chaque
+worker xdist) démarre ses propres serveurs uvicorn sur des ports libres, avec
+des bases SQLite et un répertoire d'uploads temporaires.
+Exécution : pytest (séquentiel), ou pytest -n auto --dist loadfile en CI
+"""
+
+import atexit
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+import pytest
+import pytest_asyncio
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Bases et uploads temporaires, partagés par les serveurs lancés ici et par le processus de test.
+# Créés à l'import (avant celui de api.*, qui lit DATABASE_URL) et supprimés en fin de processus
+_tmp_dir = tempfile.mkdtemp(prefix="etl_tests_")
+atexit.register(shutil.rmtree, _tmp_dir, ignore_errors=True)
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp_dir}/upload_meta.db")
+os.environ.setdefault("AUTH_DATABASE_URL", f"sqlite:///{_tmp_dir}/auth.db")
+os.environ.setdefault("UPLOAD_DIR", os.path.join(_tmp_dir, "uploads"))
+
+def _free_port():
+    """Port TCP libre sur la boucle locale"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _serve(app_path, env_var, probe_path="/docs", timeout=30.0):
+    """Démarre uvicorn pour app_path (sauf si env_var fournit déjà une URL)"""
+    base_url = os.getenv(env_var)
+    if base_url:
+        yield base_url.rstrip("/")
+        return
+
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app_path,
+         "--host", "127.0.0.1", "--port", str(port),
+         "--loop", "uvloop", "--http", "httptools", "--log-level", "warning"],
+        cwd=ROOT
+    )
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            if proc.poll() is not None:
+                pytest.skip(f"Le serveur {app_path} s'est arrêté au démarrage")
+            try:
+                if httpx.get(f"{base_url}{probe_path}").status_code < 500:
+                    break
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                pytest.skip(f"Le serveur {app_path} n'a pas répondu en {timeout:.0f} s")
+            time.sleep(0.1)
+        yield base_url
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+@pytest.fixture(scope="session")
+def api_server():
+    """URL de l'API ETL (api.main)"""
+    yield from _serve("api.main:app", "API_BASE_URL", probe_path="/health")
+
+@pytest.fixture(scope="session")
+def unified_api_server():
+    """URL de l'API unifiée (api.main_unified)"""
+    yield from _serve("api.main_unified:app", "UNIFIED_API_BASE_URL")
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def http_client():
+    """Client HTTP partagé par toute la session de tests
+
+    Un seul pool de connexions pour tous les modules : les tests ne créent
+    pas leur propre AsyncClient (vérifié par tests/test_http_clients.py).
+    """
+    limits = httpx.Limits(max_keepalive_connections=16, max_connections=16)
+    async with httpx.AsyncClient(http2=True, timeout=60.0, limits=limits) as client:
+        yield client
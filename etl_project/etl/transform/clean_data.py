@@ -113,27 +113,25 @@ class DataCleaner:
         
         self.logger.info(f"Début du traitement des valeurs aberrantes avec méthode: {method}")
         
-        for col in columns:
-            if col not in df.columns or df[col].dtype not in ['int64', 'float64']:
-                continue
-                
-            if method == 'winsorize':
+        columns = [col for col in columns
+                   if col in df.columns and df[col].dtype in ['int64', 'float64']]
+        if method == 'winsorize':
+            for col in columns:
                 df_clean[col] = stats.mstats.winsorize(df_clean[col], limits=[threshold, threshold])
-                
-            elif method == 'iqr':
-                Q1 = df_clean[col].quantile(0.25)
-                Q3 = df_clean[col].quantile(0.75)
+        
+        elif method in ('iqr', 'zscore') and columns:
+            # Détection vectorisée sur toutes les colonnes à la fois
+            values = df_clean[columns]
+            if method == 'iqr':
+                quantiles = values.quantile([0.25, 0.75])
+                Q1, Q3 = quantiles.loc[0.25], quantiles.loc[0.75]
                 IQR = Q3 - Q1
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-                
-                outliers = (df_clean[col] < lower_bound) | (df_clean[col] > upper_bound)
-                df_clean.loc[outliers, col] = df_clean[col].median()
-                
-            elif method == 'zscore':
-                z_scores = np.abs(stats.zscore(df_clean[col].dropna()))
+                outliers = (values < Q1 - 1.5 * IQR) | (values > Q3 + 1.5 * IQR)
+            else:
+                # ddof=0 comme scipy.stats.zscore
+                z_scores = np.abs((values - values.mean()) / values.std(ddof=0))
                 outliers = z_scores > 3
-                df_clean.loc[outliers.index[outliers], col] = df_clean[col].median()
+            df_clean[columns] = values.mask(outliers, values.median(), axis=1)
         
         self.cleaning_stats['outliers_handled'] = True
         self.logger.info("Traitement des valeurs aberrantes terminé")
@@ -62,22 +62,30 @@ class DataEnricher:
         
         self.logger.info(f"Début de la création de features agrégées par {group_by}")
         
+        valid_aggregations = {}
         for col, agg_funcs in aggregations.items():
             if col not in df.columns:
                 self.logger.warning(f"Colonne {col} non trouvée, ignorée")
                 continue
-                
+            valid_aggregations[col] = agg_funcs
+        
+        if valid_aggregations:
             try:
-                agg_df = df_enriched.groupby(group_by)[col].agg(agg_funcs).reset_index()
+                # Un seul groupby/agg pour toutes les colonnes : les clés de groupe sont hachées une fois
+                agg_df = df_enriched.groupby(group_by).agg(valid_aggregations)
                 
                 # Renommage des colonnes
-                agg_df.columns = [group_by] + [f"{prefix}_{col}_{func}" for func in agg_funcs]
+                agg_df.columns = [
+                    f"{prefix}_{col}_{func}"
+                    for col, agg_funcs in valid_aggregations.items()
+                    for func in agg_funcs
+                ]
                 
                 # Fusion avec le DataFrame original
-                df_enriched = df_enriched.merge(agg_df, on=group_by, how='left')
+                df_enriched = df_enriched.merge(agg_df.reset_index(), on=group_by, how='left')
                 
             except Exception as e:
-                self.logger.error(f"Erreur lors de l'agrégation de {col}: {e}")
+                self.logger.error(f"Erreur lors de l'agrégation de {list(valid_aggregations)}: {e}")
         
         self.enrichment_stats['aggregated_features_created'] = True
         self.logger.info("Création de features agrégées terminée")
@@ -7,6 +7,7 @@ from etl.transform.enrich_data import DataEnricher
 from etl.load.load_postgres import PostgreSQLLoader
 from utils.helpers import DataProfiler
 from loguru import logger
+import orjson
 import os
 from datetime import datetime
 
@@ -22,19 +23,19 @@ def root():
 
 def create_sample_data():
     """Crée des données d'exemple pour tester le pipeline ETL."""
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
     
     # Données d'exemple pour l'analyse économique
     n_samples = 1000
     
     data = {
-        'pays': np.random.choice(['Bénin', 'Burkina Faso', 'Côte d\'Ivoire', 'Sénégal', 'Mali'], n_samples),
-        'annee': np.random.randint(2015, 2024, n_samples),
-        'pib_millions': np.random.normal(50000, 20000, n_samples),
-        'population_millions': np.random.normal(15, 8, n_samples),
-        'inflation_taux': np.random.normal(2.5, 1.5, n_samples),
-        'export_millions': np.random.normal(8000, 3000, n_samples),
-        'import_millions': np.random.normal(10000, 4000, n_samples),
+        'pays': rng.choice(['Bénin', 'Burkina Faso', 'Côte d\'Ivoire', 'Sénégal', 'Mali'], n_samples),
+        'annee': rng.integers(2015, 2024, n_samples),
+        'pib_millions': rng.normal(50000, 20000, n_samples),
+        'population_millions': rng.normal(15, 8, n_samples),
+        'inflation_taux': rng.normal(2.5, 1.5, n_samples),
+        'export_millions': rng.normal(8000, 3000, n_samples),
+        'import_millions': rng.normal(10000, 4000, n_samples),
         'date_creation': pd.date_range('2023-01-01', periods=n_samples, freq='D')
     }
     
@@ -42,11 +43,11 @@ def create_sample_data():
     df = pd.DataFrame(data)
     
     # Valeurs manquantes aléatoires
-    missing_mask = np.random.random(n_samples) < 0.05
+    missing_mask = rng.random(n_samples) < 0.05
     df.loc[missing_mask, 'inflation_taux'] = np.nan
     
     # Valeurs aberrantes
-    outlier_mask = np.random.random(n_samples) < 0.02
+    outlier_mask = rng.random(n_samples) < 0.02
     df.loc[outlier_mask, 'pib_millions'] = df.loc[outlier_mask, 'pib_millions'] * 10
     
     # Doublons
@@ -207,9 +208,8 @@ def main():
         profiler.save_profile(profile_final, 'data_profile_final.json')
         
         # Sauvegarde de la comparaison
-        with open('profile_comparison.json', 'w') as f:
-            import json
-            json.dump(comparison, f, indent=2, default=str)
+        with open('profile_comparison.json', 'wb') as f:
+            f.write(orjson.dumps(comparison, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
         
         logger.info("=== PIPELINE ETL TERMINÉ AVEC SUCCÈS ===")
         
@@ -1,171 +1,186 @@
 """
 Script de migration des données Django vers FastAPI
 Migration des utilisateurs et profils depuis Django vers SQLAlchemy
+
+Les tables Django sont lues directement en SQL (pd.read_sql), sans
+démarrer l'application Django ni hydrater les modèles ligne par ligne.
 """
 
 import os
 import sys
-import django
-from datetime import datetime
-
-# Configuration Django
-sys.path.append('/Users/angevitaloura/Documents/GitHub/Dip-M-D-2/back-end')
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dip_backend.settings')
-django.setup()
-
-from django.contrib.auth.models import User as DjangoUser
-from authentication.models import UserProfile as DjangoProfile, LoginAttempt as DjangoLoginAttempt
+import pandas as pd
 
 # Configuration FastAPI
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, insert
 from sqlalchemy.orm import sessionmaker
 from auth.models import User, UserProfile, LoginAttempt, Base
 from auth.auth import get_password_hash
 
+# Configuration de la base de données Django (mêmes variables que dip_backend/settings.py)
+DJANGO_DATABASE_URL = os.getenv(
+    "DJANGO_DATABASE_URL",
+    "postgresql://{user}:{password}@{host}:{port}/{name}".format(
+        user=os.getenv("DB_USER", "postgres"),
+        password=os.getenv("DB_PASSWORD", "admin"),
+        host=os.getenv("DB_HOST", "localhost"),
+        port=os.getenv("DB_PORT", "5432"),
+        name=os.getenv("DB_NAME", "ma_base_dip"),
+    ),
+)
+django_engine = create_engine(DJANGO_DATABASE_URL)
+
+DJANGO_USERS_QUERY = """
+    SELECT id, username, email, first_name, last_name, password, is_active,
+           is_staff, is_superuser, date_joined, last_login
+    FROM auth_user
+"""
+DJANGO_PROFILES_QUERY = """
+    SELECT user_id, role, phone, organization, bio, avatar, language, timezone,
+           currency, theme, email_notifications, push_notifications,
+           weekly_reports, monthly_reports, created_at, updated_at
+    FROM authentication_userprofile
+"""
+DJANGO_ATTEMPTS_QUERY = """
+    SELECT user_id, email, ip_address, success, failure_reason, attempted_at
+    FROM authentication_loginattempt
+"""
+
 # Configuration de la base de données FastAPI
 DATABASE_URL = "sqlite:///./auth_migrated.db"
 engine = create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base.metadata.create_all(bind=engine)
 
-def migrate_users():
+# Taille des lots lus depuis Django et insérés dans FastAPI
+CHUNK_SIZE = 5000
+
+def _to_records(df):
+    """Convertir un DataFrame en liste de dicts (NaN/NaT -> None)"""
+    return df.astype(object).where(df.notna(), None).to_dict("records")
+
+def _naive_utc(dates):
+    """Dates en UTC sans fuseau (Django USE_TZ=True : dates avec fuseau, SQLite : sans)"""
+    return pd.to_datetime(dates, utc=True).dt.tz_convert(None)
+
+def _new_login_attempts(attempts_df, existing_df):
+    """Tentatives Django absentes de la base FastAPI (même email et même date)"""
+    attempts_df = attempts_df.assign(attempted_at=_naive_utc(attempts_df["attempted_at"]))
+    if existing_df.empty:
+        return attempts_df
+    existing_df = existing_df.assign(attempted_at=_naive_utc(existing_df["attempted_at"]))
+    merged = attempts_df.merge(existing_df, on=["email", "attempted_at"], how="left", indicator=True)
+    return attempts_df[(merged["_merge"] == "left_only").to_numpy()]
+
+def _login_attempt_records(attempts_df):
+    """Lignes à insérer ; user_id reste entier même avec des valeurs manquantes (sinon float64)"""
+    return _to_records(attempts_df.astype({"user_id": "Int64"}))
+
+def _read_django_chunks(query, parse_dates):
+    """Lire une table Django par lots via un curseur côté serveur"""
+    with django_engine.connect().execution_options(stream_results=True) as conn:
+        yield from pd.read_sql(query, conn, parse_dates=parse_dates, chunksize=CHUNK_SIZE)
+
+def migrate_users(db):
     """Migrer les utilisateurs Django vers FastAPI"""
-    db = SessionLocal()
     try:
         print("🔄 Début de la migration des utilisateurs...")
         
-        # Migrer les utilisateurs Django
-        django_users = DjangoUser.objects.all()
-        migrated_count = 0
+        existing_emails = {email for (email,) in db.query(User.email)}
+        migrated_ids = set()
         
-        for django_user in django_users:
-            # Vérifier si l'utilisateur existe déjà
-            existing_user = db.query(User).filter(User.email == django_user.email).first()
-            if existing_user:
-                print(f"⚠️  Utilisateur {django_user.email} déjà migré, ignoré")
+        # Lire les utilisateurs Django par lots
+        for users_df in _read_django_chunks(DJANGO_USERS_QUERY, ["date_joined", "last_login"]):
+            # Ignorer les utilisateurs déjà migrés
+            already_migrated = users_df["email"].isin(existing_emails)
+            for email in users_df.loc[already_migrated, "email"]:
+                print(f"⚠️  Utilisateur {email} déjà migré, ignoré")
+            users_df = users_df[~already_migrated]
+            if users_df.empty:
                 continue
             
-            # Créer l'utilisateur FastAPI
-            fastapi_user = User(
-                id=django_user.id,
-                username=django_user.username,
-                email=django_user.email,
-                first_name=django_user.first_name,
-                last_name=django_user.last_name,
-                hashed_password=django_user.password,  # Django utilise déjà bcrypt
-                is_active=django_user.is_active,
-                is_staff=django_user.is_staff,
-                is_superuser=django_user.is_superuser,
-                created_at=django_user.date_joined,
-                last_login=django_user.last_login
-            )
-            
-            db.add(fastapi_user)
-            migrated_count += 1
-            
-            # Migrer le profil si il existe
-            try:
-                django_profile = DjangoProfile.objects.get(user=django_user)
-                fastapi_profile = UserProfile(
-                    user_id=django_user.id,
-                    role=django_profile.role,
-                    phone=django_profile.phone,
-                    organization=django_profile.organization,
-                    bio=django_profile.bio,
-                    avatar=str(django_profile.avatar) if django_profile.avatar else None,
-                    language=django_profile.language,
-                    timezone=django_profile.timezone,
-                    currency=django_profile.currency,
-                    theme=django_profile.theme,
-                    email_notifications=django_profile.email_notifications,
-                    push_notifications=django_profile.push_notifications,
-                    weekly_reports=django_profile.weekly_reports,
-                    monthly_reports=django_profile.monthly_reports,
-                    created_at=django_profile.created_at,
-                    updated_at=django_profile.updated_at
-                )
-                db.add(fastapi_profile)
-                print(f"✅ Profil migré pour {django_user.email}")
-            except DjangoProfile.DoesNotExist:
-                # Créer un profil par défaut
-                fastapi_profile = UserProfile(user_id=django_user.id)
-                db.add(fastapi_profile)
-                print(f"📝 Profil par défaut créé pour {django_user.email}")
+            # Créer les utilisateurs FastAPI (Django utilise déjà bcrypt)
+            users_df = users_df.rename(columns={
+                "password": "hashed_password",
+                "date_joined": "created_at",
+            })
+            db.execute(insert(User), _to_records(users_df))
+            migrated_ids.update(users_df["id"].tolist())
+        migrated_count = len(migrated_ids)
+        
+        # Migrer les profils existants des utilisateurs migrés
+        profiled_ids = set()
+        for profiles_df in _read_django_chunks(DJANGO_PROFILES_QUERY, ["created_at", "updated_at"]):
+            profiles_df = profiles_df[profiles_df["user_id"].isin(migrated_ids)].copy()
+            if profiles_df.empty:
+                continue
+            profiles_df["avatar"] = profiles_df["avatar"].where(profiles_df["avatar"].astype(bool), None)
+            db.execute(insert(UserProfile), _to_records(profiles_df))
+            profiled_ids.update(profiles_df["user_id"].tolist())
+        print(f"✅ {len(profiled_ids)} profils migrés")
+        
+        # Créer un profil par défaut pour les autres
+        default_profile_ids = sorted(migrated_ids - profiled_ids)
+        for start in range(0, len(default_profile_ids), CHUNK_SIZE):
+            db.execute(insert(UserProfile), [
+                {"user_id": int(user_id)}
+                for user_id in default_profile_ids[start:start + CHUNK_SIZE]
+            ])
+        print(f"📝 {len(default_profile_ids)} profils par défaut créés")
         
-        db.commit()
         print(f"✅ Migration terminée: {migrated_count} utilisateurs migrés avec succès!")
         
     except Exception as e:
-        db.rollback()
         print(f"❌ Erreur lors de la migration: {e}")
         raise
-    finally:
-        db.close()
 
-def migrate_login_attempts():
+def migrate_login_attempts(db):
     """Migrer les tentatives de connexion Django vers FastAPI"""
-    db = SessionLocal()
     try:
         print("🔄 Début de la migration des tentatives de connexion...")
         
-        django_attempts = DjangoLoginAttempt.objects.all()
+        # Tentatives déjà migrées (même email et même date)
+        existing_df = pd.read_sql(
+            db.query(LoginAttempt.email, LoginAttempt.attempted_at).statement,
+            db.connection(),
+            parse_dates=["attempted_at"]
+        ).drop_duplicates()
         migrated_count = 0
         
-        for django_attempt in django_attempts:
-            # Vérifier si la tentative existe déjà
-            existing_attempt = db.query(LoginAttempt).filter(
-                LoginAttempt.email == django_attempt.email,
-                LoginAttempt.attempted_at == django_attempt.attempted_at
-            ).first()
-            
-            if existing_attempt:
+        for attempts_df in _read_django_chunks(DJANGO_ATTEMPTS_QUERY, ["attempted_at"]):
+            attempts_df = _new_login_attempts(attempts_df, existing_df)
+            if attempts_df.empty:
                 continue
-            
-            fastapi_attempt = LoginAttempt(
-                user_id=django_attempt.user.id if django_attempt.user else None,
-                email=django_attempt.email,
-                ip_address=django_attempt.ip_address,
-                success=django_attempt.success,
-                failure_reason=django_attempt.failure_reason,
-                attempted_at=django_attempt.attempted_at
-            )
-            
-            db.add(fastapi_attempt)
-            migrated_count += 1
+            db.execute(insert(LoginAttempt), _login_attempt_records(attempts_df))
+            migrated_count += len(attempts_df)
         
-        db.commit()
         print(f"✅ Migration terminée: {migrated_count} tentatives de connexion migrées!")
         
     except Exception as e:
-        db.rollback()
         print(f"❌ Erreur lors de la migration des tentatives: {e}")
         raise
-    finally:
-        db.close()
 
-def verify_migration():
+def verify_migration(db):
     """Vérifier la migration"""
-    db = SessionLocal()
     try:
         print("🔍 Vérification de la migration...")
         
         # Compter les utilisateurs
         fastapi_users = db.query(User).count()
-        django_users = DjangoUser.objects.count()
+        django_users = pd.read_sql("SELECT COUNT(*) FROM auth_user", django_engine).iat[0, 0]
         
         print(f"📊 Utilisateurs Django: {django_users}")
         print(f"📊 Utilisateurs FastAPI: {fastapi_users}")
         
         # Compter les profils
         fastapi_profiles = db.query(UserProfile).count()
-        django_profiles = DjangoProfile.objects.count()
+        django_profiles = pd.read_sql("SELECT COUNT(*) FROM authentication_userprofile", django_engine).iat[0, 0]
         
         print(f"📊 Profils Django: {django_profiles}")
         print(f"📊 Profils FastAPI: {fastapi_profiles}")
         
         # Compter les tentatives de connexion
         fastapi_attempts = db.query(LoginAttempt).count()
-        django_attempts = DjangoLoginAttempt.objects.count()
+        django_attempts = pd.read_sql("SELECT COUNT(*) FROM authentication_loginattempt", django_engine).iat[0, 0]
         
         print(f"📊 Tentatives Django: {django_attempts}")
         print(f"📊 Tentatives FastAPI: {fastapi_attempts}")
@@ -177,21 +192,19 @@ def verify_migration():
             
     except Exception as e:
         print(f"❌ Erreur lors de la vérification: {e}")
-    finally:
-        db.close()
 
-def create_test_user():
+def create_test_user(db):
     """Créer un utilisateur de test pour vérifier le système"""
-    db = SessionLocal()
+    print("🧪 Création d'un utilisateur de test...")
+    
+    # Vérifier si l'utilisateur test existe déjà
+    if db.query(User).filter(User.email == "test@dip.com").first():
+        print("⚠️  Utilisateur test déjà existant")
+        return
+    
+    # Point de sauvegarde : un échec ici n'annule pas la migration
+    savepoint = db.begin_nested()
     try:
-        print("🧪 Création d'un utilisateur de test...")
-        
-        # Vérifier si l'utilisateur test existe déjà
-        test_user = db.query(User).filter(User.email == "test@dip.com").first()
-        if test_user:
-            print("⚠️  Utilisateur test déjà existant")
-            return
-        
         # Créer l'utilisateur test
         test_user = User(
             username="testuser",
@@ -205,8 +218,7 @@ def create_test_user():
         )
         
         db.add(test_user)
-        db.commit()
-        db.refresh(test_user)
+        db.flush()
         
         # Créer le profil test
         test_profile = UserProfile(
@@ -218,7 +230,7 @@ def create_test_user():
         )
         
         db.add(test_profile)
-        db.commit()
+        savepoint.commit()
         
         print(f"✅ Utilisateur test créé: {test_user.email}")
         print(f"   ID: {test_user.id}")
@@ -226,31 +238,34 @@ def create_test_user():
         print(f"   Password: testpassword123")
         
     except Exception as e:
-        db.rollback()
+        savepoint.rollback()
         print(f"❌ Erreur lors de la création de l'utilisateur test: {e}")
-    finally:
-        db.close()
 
-if __name__ == "__main__":
-    print("🚀 Début de la migration Django → FastAPI")
-    print("=" * 50)
-    
-    try:
+def run_migration():
+    """Exécuter toutes les phases dans une seule session et une seule transaction"""
+    with SessionLocal() as db, db.begin():
         # Migrer les utilisateurs
-        migrate_users()
+        migrate_users(db)
         print()
         
         # Migrer les tentatives de connexion
-        migrate_login_attempts()
+        migrate_login_attempts(db)
         print()
         
         # Vérifier la migration
-        verify_migration()
+        verify_migration(db)
         print()
         
         # Créer un utilisateur de test
-        create_test_user()
+        create_test_user(db)
         print()
+
+if __name__ == "__main__":
+    print("🚀 Début de la migration Django → FastAPI")
+    print("=" * 50)
+    
+    try:
+        run_migration()
         
         print("🎉 Migration terminée avec succès!")
         print("=" * 50)
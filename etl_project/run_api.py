@@ -3,23 +3,30 @@
 Test simple de l'API ETL
 """
 
+import os
 import uvicorn
-from api.main import app
 
 if __name__ == "__main__":
+    # Un seul worker par défaut : les sessions /api/advanced sont stockées en mémoire
+    # par processus. API_WORKERS > 1 seulement une fois ces sessions partagées.
+    workers = int(os.getenv("API_WORKERS", 1))
+    
     print("🚀 Démarrage de l'API ETL DIP...")
     print("📍 URL: http://127.0.0.1:8000")
     print("📚 Documentation: http://127.0.0.1:8000/docs")
+    print(f"⚙️  Workers: {workers} (uvloop + httptools)")
     print("🔄 Appuyez sur Ctrl+C pour arrêter")
     print("=" * 50)
     
     try:
         uvicorn.run(
-            app, 
-            host="127.0.0.1", 
-            port=8000, 
+            "api.main:app",
+            host="127.0.0.1",
+            port=8000,
             log_level="info",
-            reload=False
+            workers=workers,
+            loop="uvloop",
+            http="httptools"
         )
     except KeyboardInterrupt:
         print("\n🛑 Arrêt de l'API")
@@ -11,16 +11,120 @@ import numpy as np
 from datetime import datetime
 import os
 
-# Ajouter le chemin du projet ETL
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+# Clés de configuration qui désignent des colonnes du fichier
+COLUMN_CONFIG_KEYS = ('outlier_columns', 'transform_columns', 'normalize_columns', 'date_columns', 'group_by')
 
-try:
-    from etl.transform.hybrid_processor import HybridDataProcessor, process_file_hybrid
-except ImportError as e:
-    print(f"Erreur d'import: {e}", file=sys.stderr)
-    sys.exit(1)
+# Formats de sortie acceptés par config['output_format'] (le premier par défaut)
+OUTPUT_FORMATS = ('csv', 'parquet')
+
+class InvalidProcessInput(Exception):
+    """Fichier ou configuration de traitement invalide (erreur du client)"""
+
+# Fonction pour convertir les types numpy en types Python natifs
+def convert_numpy_types(obj):
+    if isinstance(obj, dict):
+        return {key: convert_numpy_types(value) for key, value in obj.items()}
+    elif isinstance(obj, list):
+        return [convert_numpy_types(item) for item in obj]
+    elif isinstance(obj, np.integer):
+        return int(obj)
+    elif isinstance(obj, np.floating):
+        return float(obj)
+    elif isinstance(obj, np.ndarray):
+        return obj.tolist()
+    else:
+        return obj
+
+def process_file(file_path, config):
+    """
+    Traite un fichier avec le HybridDataProcessor et retourne le résultat.
+    
+    Utilisé par ce script en ligne de commande et par l'endpoint POST /process
+    de l'API, qui garde pandas et le processeur importés entre deux appels.
+    Lève InvalidProcessInput si le format du fichier ou la configuration est invalide.
+    """
+    from etl.transform.hybrid_processor import HybridDataProcessor
+    
+    if not isinstance(config, dict):
+        raise InvalidProcessInput('La configuration doit être un objet JSON')
+    
+    # Format de sortie : CSV par défaut, Parquet (zstd) sur demande
+    output_format = config.get('output_format', 'csv')
+    if output_format not in OUTPUT_FORMATS:
+        raise InvalidProcessInput(f"output_format doit valoir {' ou '.join(OUTPUT_FORMATS)}")
+    
+    # Vérifier que le fichier existe
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f'Fichier non trouvé: {file_path}')
+    
+    # Charger les données
+    if file_path.endswith('.csv'):
+        df = pd.read_csv(file_path)
+    elif file_path.endswith('.xlsx'):
+        df = pd.read_excel(file_path)
+    else:
+        raise InvalidProcessInput('Format de fichier non supporté')
+    
+    # Vérifier que les colonnes citées dans la configuration existent
+    for key in COLUMN_CONFIG_KEYS:
+        columns = config.get(key) or []
+        if isinstance(columns, str):
+            columns = [columns]
+        missing = [col for col in columns if col not in df.columns]
+        if missing:
+            raise InvalidProcessInput(f"Colonnes inconnues dans '{key}': {missing}")
+    
+    # Initialiser le processeur hybride
+    processor = HybridDataProcessor()
+    
+    # Traitement des données
+    processed_df = processor.process_data_hybrid(df, config)
+    
+    # Générer le rapport de traitement
+    report = processor.get_processing_report()
+    
+    # Sauvegarder les données traitées
+    output_dir = '/tmp/processed_data'
+    os.makedirs(output_dir, exist_ok=True)
+    
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    file_id = os.path.basename(file_path).split('.')[0]
+    output_path = os.path.join(output_dir, f'processed_{file_id}_{timestamp}.{output_format}')
+    
+    if output_format == 'parquet':
+        processed_df.to_parquet(output_path, engine='pyarrow', compression='zstd', compression_level=3, index=False)
+    else:
+        processed_df.to_csv(output_path, index=False)
+    
+    # Retourner les résultats
+    return {
+        'success': True,
+        'original_shape': list(df.shape),
+        'processed_shape': list(processed_df.shape),
+        'processing_report': convert_numpy_types(report),
+        'outlier_stats': convert_numpy_types(processor.outlier_stats),
+        'output_path': output_path,
+        'output_format': output_format,
+        'processed_at': datetime.now().isoformat(),
+        'summary': {
+            'rows_processed': int(len(processed_df)),
+            'columns_processed': int(len(processed_df.columns)),
+            'outliers_detected': int(sum(len(stats.get('iqr', {}).get('outliers', [])) for stats in processor.outlier_stats.values())),
+            'processing_mode': config.get('processing_mode', 'automatic')
+        }
+    }
 
 def main():
+    # Ajouter le chemin du projet ETL
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    
+    # Vérifier les dépendances avant tout traitement
+    try:
+        from etl.transform.hybrid_processor import HybridDataProcessor  # noqa: F401
+    except ImportError as e:
+        print(f"Erreur d'import: {e}", file=sys.stderr)
+        sys.exit(1)
+    
     if len(sys.argv) != 3:
         print(json.dumps({
             'success': False,
@@ -35,79 +139,16 @@ def main():
         # Parser la configuration
         config = json.loads(config_json)
         
-        # Vérifier que le fichier existe
-        if not os.path.exists(file_path):
-            print(json.dumps({
-                'success': False,
-                'error': f'Fichier non trouvé: {file_path}'
-            }))
-            sys.exit(1)
-        
-        # Charger les données
-        if file_path.endswith('.csv'):
-            df = pd.read_csv(file_path)
-        elif file_path.endswith('.xlsx'):
-            df = pd.read_excel(file_path)
-        else:
-            print(json.dumps({
-                'success': False,
-                'error': 'Format de fichier non supporté'
-            }))
-            sys.exit(1)
-        
-        # Initialiser le processeur hybride
-        processor = HybridDataProcessor()
-        
-        # Traitement des données
-        processed_df = processor.process_data_hybrid(df, config)
-        
-        # Générer le rapport de traitement
-        report = processor.get_processing_report()
-        
-        # Sauvegarder les données traitées
-        output_dir = '/tmp/processed_data'
-        os.makedirs(output_dir, exist_ok=True)
-        
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        file_id = os.path.basename(file_path).split('.')[0]
-        output_path = os.path.join(output_dir, f'processed_{file_id}_{timestamp}.csv')
-        
-        processed_df.to_csv(output_path, index=False)
-        
-        # Fonction pour convertir les types numpy en types Python natifs
-        def convert_numpy_types(obj):
-            if isinstance(obj, dict):
-                return {key: convert_numpy_types(value) for key, value in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_numpy_types(item) for item in obj]
-            elif isinstance(obj, np.integer):
-                return int(obj)
-            elif isinstance(obj, np.floating):
-                return float(obj)
-            elif isinstance(obj, np.ndarray):
-                return obj.tolist()
-            else:
-                return obj
-        
-        # Retourner les résultats
-        result = {
-            'success': True,
-            'original_shape': list(df.shape),
-            'processed_shape': list(processed_df.shape),
-            'processing_report': convert_numpy_types(report),
-            'outlier_stats': convert_numpy_types(processor.outlier_stats),
-            'output_path': output_path,
-            'processed_at': datetime.now().isoformat(),
-            'summary': {
-                'rows_processed': int(len(processed_df)),
-                'columns_processed': int(len(processed_df.columns)),
-                'outliers_detected': int(sum(len(stats.get('iqr', {}).get('outliers', [])) for stats in processor.outlier_stats.values())),
-                'processing_mode': config.get('processing_mode', 'automatic')
-            }
-        }
+        result = process_file(file_path, config)
         
         print(json.dumps(result, ensure_ascii=False, indent=2))
         
+    except (FileNotFoundError, InvalidProcessInput, ValueError) as e:
+        print(json.dumps({
+            'success': False,
+            'error': str(e)
+        }))
+        sys.exit(1)
     except Exception as e:
         print(json.dumps({
             'success': False,
@@ -17,21 +17,38 @@ def main():
         print("   Structure attendue: etl_project/api/main.py")
         sys.exit(1)
     
+    # API_RELOAD=false pour le mode production (API_WORKERS workers, uvloop + httptools).
+    # Un seul worker par défaut : les sessions /api/advanced sont stockées en mémoire
+    # par processus. API_WORKERS > 1 seulement une fois ces sessions partagées.
+    reload = os.getenv("API_RELOAD", "true").lower() == "true"
+    workers = int(os.getenv("API_WORKERS", 1))
+    
     print("🚀 Démarrage de l'API ETL DIP...")
     print("📍 URL: http://localhost:8000")
     print("📚 Documentation: http://localhost:8000/docs")
-    print("🔄 Mode: Reload activé")
+    print("🔄 Mode: Reload activé" if reload else f"⚙️  Mode: Production ({workers} workers)")
     print("=" * 50)
     
     try:
-        uvicorn.run(
-            "api.main:app",
-            host="127.0.0.1",
-            port=8000,
-            reload=True,
-            reload_dirs=["api", "etl", "utils"],
-            log_level="info"
-        )
+        if reload:
+            uvicorn.run(
+                "api.main:app",
+                host="127.0.0.1",
+                port=8000,
+                reload=True,
+                reload_dirs=["api", "etl", "utils"],
+                log_level="info"
+            )
+        else:
+            uvicorn.run(
+                "api.main:app",
+                host="127.0.0.1",
+                port=8000,
+                workers=workers,
+                loop="uvloop",
+                http="httptools",
+                log_level="info"
+            )
     except KeyboardInterrupt:
         print("\n🛑 Arrêt de l'API ETL")
     except Exception as e:
@@ -3,22 +3,39 @@ Script de démarrage unifié pour l'API DIP
 Démarre l'API ETL avec authentification intégrée
 """
 
+import os
 import uvicorn
-from api.main_unified import app
 
 if __name__ == "__main__":
+    # API_RELOAD=false pour le mode production (API_WORKERS workers, uvloop + httptools).
+    # Un seul worker par défaut : les sessions /api/advanced sont stockées en mémoire
+    # par processus. API_WORKERS > 1 seulement une fois ces sessions partagées.
+    reload = os.getenv("API_RELOAD", "true").lower() == "true"
+    workers = int(os.getenv("API_WORKERS", 1))
+    
     print("🚀 Démarrage de l'API DIP unifiée (ETL + Authentification)")
     print("📍 URL: http://localhost:8000")
     print("📚 Documentation: http://localhost:8000/docs")
     print("🔐 Authentification: http://localhost:8000/auth/login")
     print("=" * 60)
     
-    uvicorn.run(
-        app, 
-        host="0.0.0.0", 
-        port=8000, 
-        log_level="info",
-        reload=True
-    )
+    if reload:
+        uvicorn.run(
+            "api.main_unified:app",
+            host="0.0.0.0",
+            port=8000,
+            log_level="info",
+            reload=True
+        )
+    else:
+        uvicorn.run(
+            "api.main_unified:app",
+            host="0.0.0.0",
+            port=8000,
+            log_level="info",
+            workers=workers,
+            loop="uvloop",
+            http="httptools"
+        )
 
 
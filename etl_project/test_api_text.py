@@ -3,117 +3,186 @@
 Test de l'API avec les nouvelles fonctionnalités de traitement textuel
 """
 
-import requests
-import json
+import asyncio
+import csv
+import httpx
+import io
+import logging
+import os
+import subprocess
+import sys
 import time
 
-def test_text_processing_api():
-    """Test de l'API avec traitement textuel"""
+logger = logging.getLogger(__name__)
+
+def _start_server():
+    """Lance l'API (uvloop + httptools, plusieurs workers) dans un sous-processus
+
+    uvicorn crée ses workers lui-même : un processus multiprocessing démon
+    ne peut pas avoir d'enfants.
+    """
+    workers = os.getenv("API_WORKERS", str(os.cpu_count() or 1))
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app",
+         "--host", "127.0.0.1", "--port", "8000", "--workers", workers,
+         "--loop", "uvloop", "--http", "httptools", "--log-level", "warning"],
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+
+async def wait_ready(client, base_url, timeout=10.0):
+    """Attend que le serveur réponde, au lieu d'une pause fixe"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            response = await client.head(f"{base_url}/health")
+            if response.status_code == 200:
+                return True
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    return False
+
+# Options de transformation avec traitement textuel
+TRANSFORM_OPTIONS = {
+    "missing_strategy": "fill",
+    "handle_outliers": True,
+    "remove_duplicates": True,
+    "fix_inconsistencies": True,
+    "numerical_method": "standard",
+    "categorical_method": "label",
+    "normalize_dates": True,
+    "text_processing_enabled": True,
+    "text_columns": ["nom", "description"],
+    "extract_text_features": True,
+    "extract_keywords": True,
+    "detect_topics": True,
+    "multiple_choice_enabled": True,
+    "multiple_choice_columns": {
+        "statut": ["actif", "inactif", "suspendu"],
+        "pays": ["France", "Allemagne", "Espagne"]
+    },
+    "multiple_choice_threshold": 0.8
+}
+
+def build_csv(test_data):
+    """Sérialise les données de test en CSV en mémoire (module csv, sans pandas)"""
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator='\n')
+    writer.writerow(test_data.keys())
+    writer.writerows(zip(*test_data.values()))
+    return buf.getvalue().encode('utf-8')
+
+async def upload(client, base_url, filename, payload):
+    """Upload d'un fichier CSV, retourne son ID (None en cas d'erreur)"""
+    files = {'file': (filename, payload, 'text/csv')}
+    response = await client.post(f"{base_url}/upload", files=files)
+    
+    if response.status_code != 200:
+        print(f"Erreur upload {filename}: {response.status_code} - {response.text}")
+        return None
+    
+    file_id = response.json()['file_id']
+    print(f"Fichier {filename} uploadé avec ID: {file_id}")
+    return file_id
+
+async def transform(client, base_url, file_id, options):
+    """Transformation d'un fichier uploadé, retourne la réponse (None en cas d'erreur)"""
+    response = await client.post(
+        f"{base_url}/files/{file_id}/transform-preview",
+        json={"options": options}
+    )
+    
+    if response.status_code != 200:
+        print(f"Erreur transformation {file_id}: {response.status_code} - {response.text}")
+        return None
+    return response.json()
+
+def print_results(file_id, transform_data):
+    """Affiche les résultats d'une transformation"""
+    print(f"\n✅ Transformation réussie pour le fichier {file_id}!")
+    print(f"Métadonnées: {transform_data['metadata']['row_count']} lignes, {transform_data['metadata']['col_count']} colonnes")
+    
+    if 'keywords' in transform_data and transform_data['keywords']:
+        print("\nMots-clés extraits:")
+        for col, keywords in transform_data['keywords'].items():
+            print(f"  {col}: {keywords[:5]}")
+    
+    if 'topics' in transform_data and transform_data['topics']:
+        print("\nTopics détectés:")
+        for col, topics in transform_data['topics'].items():
+            print(f"  {col}: {topics[:3]}")
+
+# Données de test
+TEST_DATA = {
+    "nom": ["Jean Dupont", "Marie Martin", "Pierre Durand", "Sophie Bernard"],
+    "description": [
+        "Développeur senior avec 10 ans d'expérience en Python et JavaScript",
+        "Data scientist spécialisée en machine learning et analyse de données", 
+        "Chef de projet agile avec expertise en gestion d'équipe",
+        "UX/UI designer créative avec portfolio impressionnant"
+    ],
+    "pays": ["France", "france", "FRANCE", "Allemagne"],
+    "statut": ["actif", "Actif", "ACTIF", "inactif"]
+}
+
+async def run_scenario(client, base_url):
+    """Uploads puis transformations concurrents des fichiers de test"""
+    files = {'test_text.csv': build_csv(TEST_DATA)}
+    
+    # Uploads concurrents : la durée totale est celle de la requête la plus lente
+    file_ids = await asyncio.gather(*[
+        upload(client, base_url, filename, payload) for filename, payload in files.items()
+    ])
+    assert None not in file_ids, "Échec de l'upload"
     
-    # Attendre que le serveur soit prêt
-    print("Attente du serveur...")
-    time.sleep(3)
+    print("Test de transformation avec traitement textuel...")
+    results = await asyncio.gather(*[
+        transform(client, base_url, file_id, TRANSFORM_OPTIONS) for file_id in file_ids
+    ])
+    assert None not in results, "Échec de la transformation"
+    
+    for file_id, transform_data in zip(file_ids, results):
+        print_results(file_id, transform_data)
+        assert transform_data['metadata']['row_count'] == len(TEST_DATA['nom'])
+
+async def test_text_processing_api(http_client, api_server):
+    """Test de l'API avec traitement textuel"""
+    await run_scenario(http_client, api_server)
+
+async def main():
+    """Exécution hors pytest, contre un serveur déjà démarré (ou --start-server)"""
     
     # URL de base
     base_url = "http://127.0.0.1:8000"
     
+    # Client partagé : les connexions sont réutilisées entre uploads et transformations
+    client = httpx.AsyncClient(timeout=60.0)
+    
     try:
-        # Créer des données de test
-        test_data = {
-            "nom": ["Jean Dupont", "Marie Martin", "Pierre Durand", "Sophie Bernard"],
-            "description": [
-                "Développeur senior avec 10 ans d'expérience en Python et JavaScript",
-                "Data scientist spécialisée en machine learning et analyse de données", 
-                "Chef de projet agile avec expertise en gestion d'équipe",
-                "UX/UI designer créative avec portfolio impressionnant"
-            ],
-            "pays": ["France", "france", "FRANCE", "Allemagne"],
-            "statut": ["actif", "Actif", "ACTIF", "inactif"]
-        }
-        
-        # Créer un fichier CSV temporaire
-        import pandas as pd
-        import tempfile
-        import os
-        
-        df = pd.DataFrame(test_data)
-        temp_file = tempfile.NamedTemporaryFile(suffix='.csv', delete=False)
-        df.to_csv(temp_file.name, index=False)
-        temp_file.close()
-        
-        print(f"Fichier de test créé: {temp_file.name}")
-        
-        # Upload du fichier
-        with open(temp_file.name, 'rb') as f:
-            files = {'file': ('test_text.csv', f, 'text/csv')}
-            response = requests.post(f"{base_url}/upload", files=files)
-        
-        if response.status_code != 200:
-            print(f"Erreur upload: {response.status_code} - {response.text}")
+        # Attendre que le serveur soit prêt
+        print("Attente du serveur...")
+        if not await wait_ready(client, base_url):
+            print(f"Serveur indisponible sur {base_url}")
             return
         
-        upload_data = response.json()
-        file_id = upload_data['file_id']
-        print(f"Fichier uploadé avec ID: {file_id}")
-        
-        # Test de transformation avec traitement textuel
-        transform_options = {
-            "missing_strategy": "fill",
-            "handle_outliers": True,
-            "remove_duplicates": True,
-            "fix_inconsistencies": True,
-            "numerical_method": "standard",
-            "categorical_method": "label",
-            "normalize_dates": True,
-            "text_processing_enabled": True,
-            "text_columns": ["nom", "description"],
-            "extract_text_features": True,
-            "extract_keywords": True,
-            "detect_topics": True,
-            "multiple_choice_enabled": True,
-            "multiple_choice_columns": {
-                "statut": ["actif", "inactif", "suspendu"],
-                "pays": ["France", "Allemagne", "Espagne"]
-            },
-            "multiple_choice_threshold": 0.8
-        }
-        
-        print("Test de transformation avec traitement textuel...")
-        response = requests.post(
-            f"{base_url}/files/{file_id}/transform-preview",
-            json={"options": transform_options}
-        )
-        
-        if response.status_code != 200:
-            print(f"Erreur transformation: {response.status_code} - {response.text}")
-            return
-        
-        transform_data = response.json()
-        print("✅ Transformation réussie!")
-        
-        # Afficher les résultats
-        print(f"\nMétadonnées: {transform_data['metadata']['row_count']} lignes, {transform_data['metadata']['col_count']} colonnes")
-        
-        if 'keywords' in transform_data and transform_data['keywords']:
-            print("\nMots-clés extraits:")
-            for col, keywords in transform_data['keywords'].items():
-                print(f"  {col}: {keywords[:5]}")
-        
-        if 'topics' in transform_data and transform_data['topics']:
-            print("\nTopics détectés:")
-            for col, topics in transform_data['topics'].items():
-                print(f"  {col}: {topics[:3]}")
-        
-        # Nettoyer
-        os.unlink(temp_file.name)
+        await run_scenario(client, base_url)
         
     except Exception as e:
-        print(f"Erreur: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Erreur: {e}")
+    finally:
+        await client.aclose()
 
 if __name__ == "__main__":
-    test_text_processing_api()
+    # --start-server : démarre l'API ici au lieu d'utiliser un serveur déjà lancé
+    server = None
+    if "--start-server" in sys.argv:
+        server = _start_server()
+    try:
+        asyncio.run(main())
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
 
 
 
@@ -1,105 +1,58 @@
 #!/usr/bin/env python3
 """
-Script de test pour l'endpoint de recherche de pays
+Tests pytest de l'endpoint de recherche de pays
+
+Le serveur API unifié est démarré par la fixture unified_api_server
+(conftest.py), ou pris sur UNIFIED_API_BASE_URL s'il tourne déjà.
+Les tests sont ignorés si Nominatim (géocodeur utilisé par l'API) est injoignable.
+Exécution en parallèle : pytest test_country_search.py -n auto
 """
 
-import asyncio
-import httpx
-import json
+import sys
 
-async def test_country_search():
+import httpx
+import pytest
+import pytest_asyncio
+
+from api.country_search import NOMINATIM_URL
+
+# Tous les tests partagent la boucle de session du client HTTP (conftest.py)
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def geocoder(http_client):
+    """Ignore le module si Nominatim ne répond pas (pas d'accès réseau)"""
+    try:
+        await http_client.head(NOMINATIM_URL, timeout=5.0)
+    except httpx.TransportError as e:
+        pytest.skip(f"Nominatim injoignable: {e!r}")
+
+@pytest.mark.parametrize("query,description", [
+    ("France", "Recherche par nom de pays"),
+    ("FR", "Recherche par code pays"),
+    ("Senegal", "Recherche pays africain"),
+    ("United States", "Recherche pays avec espaces"),
+])
+async def test_country_search(http_client, geocoder, unified_api_server, query, description):
     """Test de l'endpoint de recherche de pays"""
-    
-    # URL de base de l'API
-    base_url = "http://localhost:8000"
-    
-    # Tests à effectuer
-    test_cases = [
-        {"query": "France", "description": "Recherche par nom de pays"},
-        {"query": "FR", "description": "Recherche par code pays"},
-        {"query": "Senegal", "description": "Recherche pays africain"},
-        {"query": "United States", "description": "Recherche pays avec espaces"},
-    ]
-    
-    print("🧪 Test de l'endpoint de recherche de pays")
-    print("=" * 50)
-    
-    async with httpx.AsyncClient() as client:
-        for i, test_case in enumerate(test_cases, 1):
-            print(f"\n📋 Test {i}: {test_case['description']}")
-            print(f"🔍 Recherche: '{test_case['query']}'")
-            
-            try:
-                # Test de l'endpoint de recherche unique
-                response = await client.get(
-                    f"{base_url}/search/country",
-                    params={"q": test_case["query"]},
-                    timeout=10.0
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get("success"):
-                        country = data.get("country", {})
-                        print(f"✅ Succès!")
-                        print(f"   📍 Pays: {country.get('name', 'N/A')}")
-                        print(f"   🗺️  Coordonnées: {country.get('lat', 'N/A')}, {country.get('lon', 'N/A')}")
-                        print(f"   🆔 Place ID: {country.get('place_id', 'N/A')}")
-                    else:
-                        print(f"❌ Échec: {data.get('detail', 'Erreur inconnue')}")
-                else:
-                    print(f"❌ Erreur HTTP {response.status_code}: {response.text}")
-                    
-            except httpx.TimeoutException:
-                print("⏰ Timeout - Le serveur met trop de temps à répondre")
-            except httpx.ConnectError:
-                print("🔌 Erreur de connexion - Le serveur n'est pas démarré")
-            except Exception as e:
-                print(f"❌ Erreur inattendue: {e}")
-    
-    print("\n" + "=" * 50)
-    print("🏁 Tests terminés")
-
-async def test_multiple_countries():
-    """Test de l'endpoint de recherche multiple"""
-    
-    print("\n🔍 Test de recherche multiple de pays")
-    print("-" * 40)
-    
-    base_url = "http://localhost:8000"
-    
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(
-                f"{base_url}/search/countries",
-                params={"q": "africa", "limit": 3},
-                timeout=10.0
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get("success"):
-                    countries = data.get("countries", [])
-                    print(f"✅ Trouvé {len(countries)} pays pour 'africa':")
-                    for country in countries:
-                        print(f"   📍 {country.get('name', 'N/A')}")
-                else:
-                    print(f"❌ Échec: {data.get('detail', 'Erreur inconnue')}")
-            else:
-                print(f"❌ Erreur HTTP {response.status_code}: {response.text}")
-                
-        except Exception as e:
-            print(f"❌ Erreur: {e}")
+    response = await http_client.get(f"{unified_api_server}/search/country", params={"q": query})
 
-if __name__ == "__main__":
-    print("🚀 Démarrage des tests de l'API de recherche de pays")
-    print("⚠️  Assurez-vous que le serveur API est démarré sur http://localhost:8000")
-    print()
-    
-    # Exécuter les tests
-    asyncio.run(test_country_search())
-    asyncio.run(test_multiple_countries())
+    assert response.status_code == 200, f"{description}: HTTP {response.status_code} {response.text}"
+    data = response.json()
+    assert data.get("success"), f"{description}: {data.get('detail', 'Erreur inconnue')}"
 
+    country = data.get("country", {})
+    assert country.get("name")
+    assert country.get("lat") is not None and country.get("lon") is not None
 
+async def test_multiple_countries(http_client, geocoder, unified_api_server):
+    """Test de l'endpoint de recherche multiple"""
+    response = await http_client.get(f"{unified_api_server}/search/countries", params={"q": "africa", "limit": 3})
 
+    assert response.status_code == 200, f"HTTP {response.status_code} {response.text}"
+    data = response.json()
+    assert data.get("success"), data.get("detail", "Erreur inconnue")
+    assert len(data.get("countries", [])) <= 3
 
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
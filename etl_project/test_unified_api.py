@@ -3,10 +3,14 @@ Script de test complet pour l'API DIP unifiée
 Teste l'authentification et les fonctionnalités ETL
 """
 
-import requests
-import json
+import asyncio
+import httpx
+import io
 import os
-from datetime import datetime
+import sys
+
+# Script à exécuter contre un serveur démarré : non collecté par pytest
+__test__ = False
 
 # Configuration
 API_BASE_URL = "http://localhost:8000"
@@ -18,17 +22,13 @@ TEST_USER = {
     "last_name": "Unified"
 }
 
-def test_auth_endpoints():
+async def test_auth_endpoints(client):
     """Tester les endpoints d'authentification"""
     print("🔐 Test des endpoints d'authentification...")
     
     # Test d'inscription
     print("1. Test d'inscription...")
-    register_response = requests.post(
-        f"{API_BASE_URL}/auth/register",
-        json=TEST_USER,
-        headers={"Content-Type": "application/json"}
-    )
+    register_response = await client.post("/auth/register", json=TEST_USER)
     
     if register_response.status_code == 200:
         print("✅ Inscription réussie")
@@ -46,11 +46,7 @@ def test_auth_endpoints():
         "password": TEST_USER["password"]
     }
     
-    login_response = requests.post(
-        f"{API_BASE_URL}/auth/login",
-        json=login_data,
-        headers={"Content-Type": "application/json"}
-    )
+    login_response = await client.post("/auth/login", json=login_data)
     
     if login_response.status_code == 200:
         print("✅ Connexion réussie")
@@ -64,22 +60,20 @@ def test_auth_endpoints():
     
     return access_token
 
-def test_protected_endpoints(access_token):
+async def test_protected_endpoints(client, access_token):
     """Tester les endpoints protégés"""
     print("\n🔒 Test des endpoints protégés...")
     
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json"
-    }
+    headers = {"Authorization": f"Bearer {access_token}"}
     
-    # Test du profil utilisateur
-    print("1. Test du profil utilisateur...")
-    profile_response = requests.get(
-        f"{API_BASE_URL}/auth/profile",
-        headers=headers
+    # Profil et liste des fichiers sont indépendants : requêtes concurrentes
+    profile_response, files_response = await asyncio.gather(
+        client.get("/auth/profile", headers=headers),
+        client.get("/files", headers=headers)
     )
     
+    # Test du profil utilisateur
+    print("1. Test du profil utilisateur...")
     if profile_response.status_code == 200:
         print("✅ Profil utilisateur récupéré")
         profile_data = profile_response.json()
@@ -89,11 +83,6 @@ def test_protected_endpoints(access_token):
     
     # Test de la liste des fichiers
     print("2. Test de la liste des fichiers...")
-    files_response = requests.get(
-        f"{API_BASE_URL}/files",
-        headers=headers
-    )
-    
     if files_response.status_code == 200:
         print("✅ Liste des fichiers récupérée")
         files_data = files_response.json()
@@ -103,49 +92,40 @@ def test_protected_endpoints(access_token):
     
     return True
 
-def test_file_upload(access_token):
-    """Tester l'upload de fichier"""
-    print("\n📁 Test d'upload de fichier...")
-    
-    # Créer un fichier CSV de test
-    test_csv_content = """name,age,city
+# Fichier CSV de test par défaut
+TEST_CSV_CONTENT = b"""name,age,city
 John,25,Paris
 Jane,30,Lyon
 Bob,35,Marseille"""
+
+async def test_file_upload(client, access_token, path=None):
+    """Tester l'upload de fichier (CSV de test, ou fichier réel via path)"""
+    print("\n📁 Test d'upload de fichier...")
     
-    # Sauvegarder temporairement
-    test_file_path = "test_data.csv"
-    with open(test_file_path, "w") as f:
-        f.write(test_csv_content)
+    headers = {"Authorization": f"Bearer {access_token}"}
     
-    try:
-        headers = {"Authorization": f"Bearer {access_token}"}
-        
-        with open(test_file_path, "rb") as f:
-            files = {"file": ("test_data.csv", f, "text/csv")}
-            upload_response = requests.post(
-                f"{API_BASE_URL}/files/upload",
-                files=files,
-                headers=headers
-            )
-        
-        if upload_response.status_code == 200:
-            print("✅ Upload de fichier réussi")
-            upload_data = upload_response.json()
-            print(f"   Fichier ID: {upload_data['file_id']}")
-            print(f"   Nombre de lignes: {upload_data['rows']}")
-            return upload_data['file_id']
-        else:
-            print(f"❌ Échec de l'upload: {upload_response.status_code}")
-            print(f"   Erreur: {upload_response.text}")
-            return None
-            
-    finally:
-        # Nettoyer le fichier de test
-        if os.path.exists(test_file_path):
-            os.remove(test_file_path)
+    # httpx lit l'objet fichier par blocs pendant l'envoi multipart :
+    # un gros fichier n'est jamais chargé entièrement en mémoire
+    if path:
+        with open(path, "rb") as f:
+            files = {"file": (os.path.basename(path), f, "text/csv")}
+            upload_response = await client.post("/files/upload", files=files, headers=headers)
+    else:
+        files = {"file": ("test_data.csv", io.BytesIO(TEST_CSV_CONTENT), "text/csv")}
+        upload_response = await client.post("/files/upload", files=files, headers=headers)
+    
+    if upload_response.status_code == 200:
+        print("✅ Upload de fichier réussi")
+        upload_data = upload_response.json()
+        print(f"   Fichier ID: {upload_data['file_id']}")
+        print(f"   Nombre de lignes: {upload_data['rows']}")
+        return upload_data['file_id']
+    else:
+        print(f"❌ Échec de l'upload: {upload_response.status_code}")
+        print(f"   Erreur: {upload_response.text}")
+        return None
 
-def test_file_processing(file_id, access_token):
+async def test_file_processing(client, file_id, access_token):
     """Tester le traitement de fichier"""
     if not file_id:
         print("❌ Pas de fichier à traiter")
@@ -153,10 +133,7 @@ def test_file_processing(file_id, access_token):
     
     print(f"\n⚙️ Test de traitement de fichier (ID: {file_id})...")
     
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json"
-    }
+    headers = {"Authorization": f"Bearer {access_token}"}
     
     # Configuration de traitement
     processing_config = {
@@ -175,8 +152,8 @@ def test_file_processing(file_id, access_token):
     }
     
     # Test de transformation
-    transform_response = requests.post(
-        f"{API_BASE_URL}/files/{file_id}/transform",
+    transform_response = await client.post(
+        f"/files/{file_id}/transform",
         json=processing_config,
         headers=headers
     )
@@ -191,7 +168,7 @@ def test_file_processing(file_id, access_token):
         print(f"❌ Échec de la transformation: {transform_response.status_code}")
         print(f"   Erreur: {transform_response.text}")
 
-def test_export(file_id, access_token):
+async def test_export(client, file_id, access_token):
     """Tester l'export de fichier"""
     if not file_id:
         print("❌ Pas de fichier à exporter")
@@ -201,13 +178,14 @@ def test_export(file_id, access_token):
     
     headers = {"Authorization": f"Bearer {access_token}"}
     
-    # Test d'export CSV
-    print("1. Test d'export CSV...")
-    csv_response = requests.get(
-        f"{API_BASE_URL}/files/{file_id}/export-hybrid?format=csv",
-        headers=headers
+    # Exports CSV et XLSX en parallèle
+    csv_response, xlsx_response = await asyncio.gather(
+        client.get(f"/files/{file_id}/export-hybrid", params={"format": "csv"}, headers=headers),
+        client.get(f"/files/{file_id}/export-hybrid", params={"format": "xlsx"}, headers=headers)
     )
     
+    # Test d'export CSV
+    print("1. Test d'export CSV...")
     if csv_response.status_code == 200:
         print("✅ Export CSV réussi")
         print(f"   Taille du fichier: {len(csv_response.content)} bytes")
@@ -216,51 +194,50 @@ def test_export(file_id, access_token):
     
     # Test d'export XLSX
     print("2. Test d'export XLSX...")
-    xlsx_response = requests.get(
-        f"{API_BASE_URL}/files/{file_id}/export-hybrid?format=xlsx",
-        headers=headers
-    )
-    
     if xlsx_response.status_code == 200:
         print("✅ Export XLSX réussi")
         print(f"   Taille du fichier: {len(xlsx_response.content)} bytes")
     else:
         print(f"❌ Échec de l'export XLSX: {xlsx_response.status_code}")
 
-def main():
+async def main(upload_path=None):
     """Fonction principale de test"""
     print("🧪 Test complet de l'API DIP unifiée")
     print("=" * 50)
     
-    # Vérifier que l'API est accessible
-    try:
-        response = requests.get(f"{API_BASE_URL}/")
-        if response.status_code != 200:
-            print(f"❌ API non accessible sur {API_BASE_URL}")
+    # Un seul client : la connexion est réutilisée par tous les tests
+    limits = httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=30)
+    async with httpx.AsyncClient(base_url=API_BASE_URL, http2=True, timeout=60.0,
+                                 limits=limits) as client:
+        # Vérifier que l'API est accessible
+        try:
+            response = await client.get("/")
+            if response.status_code != 200:
+                print(f"❌ API non accessible sur {API_BASE_URL}")
+                return
+            print(f"✅ API accessible sur {API_BASE_URL}")
+        except httpx.ConnectError:
+            print(f"❌ Impossible de se connecter à {API_BASE_URL}")
+            print("   Assurez-vous que l'API est démarrée avec: python start_unified_api.py")
             return
-        print(f"✅ API accessible sur {API_BASE_URL}")
-    except requests.exceptions.ConnectionError:
-        print(f"❌ Impossible de se connecter à {API_BASE_URL}")
-        print("   Assurez-vous que l'API est démarrée avec: python start_unified_api.py")
-        return
-    
-    # Tests d'authentification
-    access_token = test_auth_endpoints()
-    if not access_token:
-        print("❌ Tests d'authentification échoués")
-        return
-    
-    # Tests des endpoints protégés
-    test_protected_endpoints(access_token)
-    
-    # Test d'upload de fichier
-    file_id = test_file_upload(access_token)
-    
-    # Test de traitement de fichier
-    test_file_processing(file_id, access_token)
-    
-    # Test d'export
-    test_export(file_id, access_token)
+        
+        # Tests d'authentification
+        access_token = await test_auth_endpoints(client)
+        if not access_token:
+            print("❌ Tests d'authentification échoués")
+            return
+        
+        # Tests des endpoints protégés
+        await test_protected_endpoints(client, access_token)
+        
+        # Test d'upload de fichier
+        file_id = await test_file_upload(client, access_token, upload_path)
+        
+        # Test de traitement de fichier
+        await test_file_processing(client, file_id, access_token)
+        
+        # Test d'export
+        await test_export(client, file_id, access_token)
     
     print("\n🎉 Tests terminés!")
     print("=" * 50)
@@ -272,6 +249,7 @@ def main():
     print("✅ Export CSV/XLSX disponible")
 
 if __name__ == "__main__":
-    main()
+    # Usage: python test_unified_api.py [fichier.csv]
+    asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else None))
 
 
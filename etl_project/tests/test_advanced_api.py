@@ -0,0 +1,73 @@
+import io
+
+import orjson
+import pytest
+import pytest_asyncio
+
+# Tous les tests partagent la boucle de session du client HTTP (conftest.py)
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+TEST_CSV = (
+    "Pays_Exportateur,Pays_Importateur,Produit,Valeur_USD,Volume_Tonnes,Année,Mois,Region\n"
+    "France,Allemagne,Blé,15000000,50000,2023,1,Europe\n"
+    "Espagne,Italie,Tomates,8500000,25000,2023,1,Europe\n"
+    "Brésil,Chine,Soja,45000000,120000,2023,1,Amérique\n"
+    "États-Unis,Japon,Riz,22000000,80000,2023,2,Amérique\n"
+    "Canada,Mexique,Maïs,18000000,60000,2023,2,Amérique\n"
+    "Sénégal,France,Arachides,,15000,2023,2,Afrique\n"
+).encode("utf-8")
+
+CHART_CONFIGS = [
+    {'type': 'line', 'x_col': 'Mois', 'y_cols': ['Valeur_USD'], 'title': 'Valeurs USD par Mois'},
+    {'type': 'bar', 'x_col': 'Pays_Exportateur', 'y_cols': ['Valeur_USD'], 'title': 'Valeurs USD par Pays'},
+    {'type': 'scatter', 'x_col': 'Volume_Tonnes', 'y_col': 'Valeur_USD', 'title': 'Valeur USD selon le Volume'},
+]
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def session_id(http_client, api_server):
+    """Session d'analyse avancée, créée par un seul upload pour tout le module."""
+    files = {'file': ('test_data.csv', io.BytesIO(TEST_CSV), 'text/csv')}
+    response = await http_client.post(f"{api_server}/api/advanced/upload-advanced", files=files)
+    assert response.status_code == 200, response.text
+    return orjson.loads(response.content)['session_id']
+
+
+@pytest.mark.parametrize("path", ["analytics", "recommendations", "charts", "session"])
+async def test_session_endpoints(http_client, api_server, session_id, path):
+    """Les endpoints de lecture répondent pour la session."""
+    response = await http_client.get(f"{api_server}/api/advanced/{path}/{session_id}")
+
+    assert response.status_code == 200, response.text
+    assert orjson.loads(response.content)['success'] == True
+
+
+async def test_analytics(http_client, api_server, session_id):
+    """Les analyses reprennent les statistiques calculées à l'upload."""
+    response = await http_client.get(f"{api_server}/api/advanced/analytics/{session_id}")
+    analytics = orjson.loads(response.content)
+
+    assert analytics['statistics']['rows'] == TEST_CSV.count(b"\n") - 1
+    assert analytics['statistics']['missing_values']['Valeur_USD'] == 1
+    assert 'missing_values' in analytics['inconsistencies']
+    assert analytics['insights']
+
+
+async def test_session_info(http_client, api_server, session_id):
+    """Les informations de session décrivent le fichier uploadé."""
+    response = await http_client.get(f"{api_server}/api/advanced/session/{session_id}")
+
+    assert orjson.loads(response.content)['data_shape'] == [TEST_CSV.count(b"\n") - 1, 8]
+
+
+async def test_chart_creation(http_client, api_server, session_id):
+    """Un seul appel crée tous les graphiques du lot."""
+    response = await http_client.post(
+        f"{api_server}/api/advanced/create-charts-batch/{session_id}",
+        json={'charts': CHART_CONFIGS}
+    )
+
+    assert response.status_code == 200, response.text
+    charts = orjson.loads(response.content)['charts']
+    assert len(charts) == len(CHART_CONFIGS)
+    assert [chart['title'] for chart in charts] == [config['title'] for config in CHART_CONFIGS]
@@ -0,0 +1,56 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from api.advanced_routes import sessions
+from api.main import create_app
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Client de test de l'API ETL (bases temporaires de conftest.py)."""
+    with TestClient(create_app()) as test_client:
+        yield test_client
+
+
+@pytest.mark.parametrize("path", ["/docs", "/files"])
+def test_etag_not_modified(client, path):
+    """Une requête avec l'ETag courant reçoit un 304 sans corps."""
+    response = client.get(path)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    cached = client.get(path, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+
+def test_files_etag_changes_after_upload(client):
+    """L'ETag de /files change dès qu'un fichier est ajouté."""
+    etag = client.get("/files").headers["etag"]
+
+    upload = client.post("/upload", files={"file": ("etag.csv", b"a,b\n1,2\n", "text/csv")})
+    assert upload.status_code == 200
+
+    response = client.get("/files", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+@pytest.mark.parametrize("endpoint", ["analytics", "recommendations"])
+def test_session_etag_not_modified(client, endpoint):
+    """Les analyses d'une session sont revalidées par l'ETag de la session."""
+    sessions["session_etag"] = {
+        "etag": '"etag-test"',
+        "statistics": {}, "correlations": {}, "insights": {}, "inconsistencies": {}
+    }
+    path = f"/api/advanced/{endpoint}/session_etag"
+
+    response = client.get(path)
+    assert response.status_code == 200
+    assert response.headers["etag"] == '"etag-test"'
+    assert response.headers["cache-control"] == "private, max-age=300"
+
+    assert client.get(path, headers={"If-None-Match": '"etag-test"'}).status_code == 304
+    assert client.get(path, headers={"If-None-Match": 'W/"etag-test"'}).status_code == 304
+    assert client.get(path, headers={"If-None-Match": '"autre"'}).status_code == 200
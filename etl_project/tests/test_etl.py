@@ -11,9 +11,9 @@ from utils.helpers import DataProfiler
 class TestETLPipeline:
     """Tests unitaires pour le pipeline ETL."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def sample_data(self):
-        """Crée des données de test."""
+        """Crée des données de test (une fois par module, à ne pas modifier)."""
         np.random.seed(42)
         
         data = {
@@ -37,19 +37,38 @@ class TestETLPipeline:
         
         return df
     
+    @pytest.fixture(scope="module")
+    def cleaned_data(self, sample_data):
+        """Données nettoyées, partagées par les tests du pipeline."""
+        return DataCleaner().clean_data(sample_data)
+    
+    @pytest.fixture(scope="module")
+    def normalized_data(self, cleaned_data):
+        """Données nettoyées puis normalisées."""
+        return DataNormalizer().normalize_data(cleaned_data)
+    
+    @pytest.fixture(scope="module")
+    def enriched_data(self, normalized_data):
+        """Données nettoyées, normalisées puis enrichies."""
+        conditions = {
+            'pib_par_habitant': lambda df: df['pib_millions'] / df['population_millions']
+        }
+        return DataEnricher().enrich_data(normalized_data, conditional_columns=conditions)
+    
     def test_csv_extractor(self, sample_data, tmp_path):
         """Test de l'extracteur CSV."""
         # Sauvegarde des données de test
         csv_path = tmp_path / "test_data.csv"
         sample_data.to_csv(csv_path, index=False)
         
-        # Test de l'extracteur
+        # Test de l'extracteur (moteur pyarrow, colonnes Arrow : pas d'objets Python)
         extractor = CSVExtractor()
-        df_extracted = extractor.read_csv(str(csv_path))
+        df_extracted = extractor.read_csv(str(csv_path), engine='pyarrow', dtype_backend='pyarrow')
         
         # Vérifications
         assert len(df_extracted) == len(sample_data)
         assert list(df_extracted.columns) == list(sample_data.columns)
+        pd.testing.assert_frame_equal(df_extracted, sample_data.convert_dtypes(dtype_backend='pyarrow'))
         
         # Test de validation
         validation_info = extractor.validate_csv(df_extracted)
@@ -80,6 +99,20 @@ class TestETLPipeline:
         assert cleaner.cleaning_stats['outliers_handled'] == True
         assert cleaner.cleaning_stats['inconsistencies_fixed'] == True
     
+    @pytest.mark.parametrize("method", ['iqr', 'zscore'])
+    def test_outlier_methods(self, sample_data, method):
+        """Test du remplacement des valeurs aberrantes par la médiane."""
+        df = sample_data.copy()
+        df.loc[20, 'export_millions'] = 1e7
+        cleaner = DataCleaner()
+
+        df_clean = cleaner.handle_outliers(df, method=method)
+
+        # Vérifications
+        assert df_clean.loc[20, 'export_millions'] == df['export_millions'].median()
+        assert df_clean['pib_millions'].isnull().sum() == df['pib_millions'].isnull().sum()
+        assert cleaner.cleaning_stats['outliers_handled'] == True
+
     def test_data_normalizer(self, sample_data):
         """Test du normaliseur de données."""
         normalizer = DataNormalizer()
@@ -137,50 +170,83 @@ class TestETLPipeline:
         # Vérification des statistiques d'enrichissement
         assert enricher.enrichment_stats['conditional_columns_created'] == 2
     
-    def test_data_profiler(self, sample_data):
-        """Test du profileur de données."""
+    @pytest.fixture(scope="module")
+    def profiled(self, sample_data):
+        """Profileur et profil de sample_data, calculés une fois par module."""
         profiler = DataProfiler()
+        return profiler, profiler.profile_dataframe(sample_data)
+    
+    def test_profile_sections(self, profiled):
+        """Test des sections du profil."""
+        _, profile = profiled
         
-        # Test du profilage
-        profile = profiler.profile_dataframe(sample_data)
-        
-        # Vérifications
-        assert 'basic_info' in profile
-        assert 'data_types' in profile
-        assert 'missing_values' in profile
-        assert 'duplicates' in profile
-        assert 'statistical_summary' in profile
+        for section in ['basic_info', 'data_types', 'missing_values', 'duplicates', 'statistical_summary']:
+            assert section in profile
+    
+    def test_profile_basic_info(self, sample_data, profiled):
+        """Test des informations de base du profil."""
+        _, profile = profiled
         
-        # Vérification des informations de base
         assert profile['basic_info']['rows'] == len(sample_data)
         assert profile['basic_info']['columns'] == len(sample_data.columns)
+    
+    def test_profile_missing_and_duplicates(self, profiled):
+        """Test des valeurs manquantes et des doublons du profil."""
+        _, profile = profiled
         
-        # Vérification des valeurs manquantes
         assert profile['missing_values']['total_missing'] > 0
-        
-        # Vérification des doublons
         assert profile['duplicates']['has_duplicates'] == True
     
-    def test_end_to_end_pipeline(self, sample_data):
+    def test_profile_column_cache(self, sample_data, profiled):
+        """Les colonnes inchangées sont reprises du cache du profileur."""
+        profiler, profile = profiled
+        cache_size = len(profiler._col_cache)
+        
+        df_modified = sample_data.assign(annee=sample_data['annee'] + 1)
+        profile_modified = profiler.profile_dataframe(df_modified)
+        
+        assert len(profiler._col_cache) == cache_size + 1
+        assert profile_modified['column_profiles']['pays'] == profile['column_profiles']['pays']
+        assert profile_modified['column_profiles']['annee']['min'] == sample_data['annee'].min() + 1
+
+    def test_profile_column_cache_isolated_and_bounded(self, sample_data):
+        """Profils en cache copiés en profondeur, cache borné (LRU)."""
+        df = sample_data.astype({'pays': object})  # top_values : colonnes object
+        profiler = DataProfiler()
+        profiler.COLUMN_CACHE_SIZE = len(df.columns)
+        
+        first = profiler.profile_dataframe(df)
+        first['column_profiles']['pays']['top_values'].clear()
+        second = profiler.profile_dataframe(df)
+        assert second['column_profiles']['pays']['top_values']
+        
+        profiler.profile_dataframe(df.add_suffix('_bis'))
+        assert len(profiler._col_cache) == profiler.COLUMN_CACHE_SIZE
+    
+    def test_profile_save_load(self, sample_data, profiled, tmp_path):
+        """Test de la sauvegarde et du rechargement d'un profil."""
+        profiler, profile = profiled
+
+        profile_path = tmp_path / "profile.json"
+        profiler.save_profile(profile, str(profile_path))
+        loaded = profiler.load_profile(str(profile_path))
+
+        # Vérifications : types numpy et Series restitués en JSON natif
+        assert loaded['basic_info']['rows'] == len(sample_data)
+        assert loaded['missing_values']['total_missing'] == profile['missing_values']['total_missing']
+        assert loaded['missing_values']['missing_by_column'] == profile['missing_values']['missing_by_column'].to_dict()
+        assert loaded['duplicates']['has_duplicates'] == True
+
+    def test_end_to_end_pipeline(self, sample_data, cleaned_data, enriched_data):
         """Test du pipeline ETL complet."""
         # 1. Extraction (simulation)
         extractor = CSVExtractor()
         validation_info = extractor.validate_csv(sample_data)
+        assert validation_info['is_valid'] == True
         
-        # 2. Nettoyage
-        cleaner = DataCleaner()
-        df_cleaned = cleaner.clean_data(sample_data)
-        
-        # 3. Normalisation
-        normalizer = DataNormalizer()
-        df_normalized = normalizer.normalize_data(df_cleaned)
-        
-        # 4. Enrichissement
-        enricher = DataEnricher()
-        conditions = {
-            'pib_par_habitant': lambda df: df['pib_millions'] / df['population_millions']
-        }
-        df_enriched = enricher.enrich_data(df_normalized, conditional_columns=conditions)
+        # 2-4. Nettoyage, normalisation et enrichissement : fixtures partagées
+        df_enriched = enriched_data
+        assert len(cleaned_data) < len(sample_data)  # Doublons supprimés
         
         # 5. Profilage final
         profiler = DataProfiler()
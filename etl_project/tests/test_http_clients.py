@@ -0,0 +1,84 @@
+import ast
+from pathlib import Path
+
+import pytest
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+TEST_SCRIPTS = sorted(PROJECT_DIR.glob("test_*.py"))
+ALL_TEST_SCRIPTS = sorted(
+    TEST_SCRIPTS
+    + list(PROJECT_DIR.glob("tests/test_*.py"))
+    + list(PROJECT_DIR.parent.glob("test_*.py"))
+    + list(PROJECT_DIR.parent.glob("back-end/test_*.py"))
+)
+HTTP_METHODS = {'get', 'post', 'put', 'patch', 'delete', 'head', 'options', 'request'}
+
+
+def _client_constructions(tree):
+    """Tests et fixtures qui construisent leur propre httpx.AsyncClient."""
+    offenders = []
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        is_fixture = any('fixture' in ast.unparse(dec) for dec in node.decorator_list)
+        if not (node.name.startswith('test_') or is_fixture):
+            continue
+        for call in ast.walk(node):
+            if isinstance(call, ast.Call) and ast.unparse(call.func).endswith('AsyncClient'):
+                offenders.append(f"{node.name}:{call.lineno}")
+    return offenders
+
+
+def _is_http_call(node):
+    """Appel client.get(...), SESSION.post(...), requests.get(...) (attendu ou non)."""
+    if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+            and node.func.attr in HTTP_METHODS):
+        return False
+    receiver = ast.unparse(node.func.value).split('.')[-1].lower()
+    return receiver == 'requests' or 'client' in receiver or 'session' in receiver
+
+
+def _requests_in_loops(tree):
+    """Requêtes HTTP envoyées une à une dans une boucle for (cascade séquentielle).
+
+    Les boucles while (attente de disponibilité du serveur) sont séquentielles par nature.
+    Une requête dans des boucles imbriquées n'est signalée qu'une fois.
+    """
+    calls = {}
+    for loop in ast.walk(tree):
+        if not isinstance(loop, (ast.For, ast.AsyncFor)):
+            continue
+        for node in ast.walk(loop):
+            if _is_http_call(node):
+                calls[id(node)] = node
+    return sorted(f"{ast.unparse(node.func)}:{node.lineno}" for node in calls.values())
+
+
+@pytest.mark.parametrize("script", TEST_SCRIPTS, ids=lambda p: p.name)
+def test_tests_use_shared_http_client(script):
+    """Les tests passent par la fixture http_client de conftest.py."""
+    tree = ast.parse(script.read_text(encoding='utf-8'))
+    assert _client_constructions(tree) == []
+
+
+@pytest.mark.parametrize("script", ALL_TEST_SCRIPTS, ids=lambda p: str(p.relative_to(PROJECT_DIR.parent)))
+def test_no_sequential_request_loops(script):
+    """Les requêtes indépendantes d'une boucle partent ensemble via asyncio.gather."""
+    tree = ast.parse(script.read_text(encoding='utf-8'))
+    assert _requests_in_loops(tree) == []
+
+
+def test_request_loop_detection():
+    """Appels synchrones et attendus détectés, une seule fois en cas d'imbrication."""
+    tree = ast.parse(
+        "async def probe(client):\n"
+        "    for host in hosts:\n"
+        "        for path in paths:\n"
+        "            await client.get(path)\n"
+        "        SESSION.post(host)\n"
+        "        requests.get(host)\n"
+        "        data.get(host)\n"
+        "    while True:\n"
+        "        await client.head('/health')\n"
+    )
+    assert _requests_in_loops(tree) == ['SESSION.post:5', 'client.get:4', 'requests.get:6']
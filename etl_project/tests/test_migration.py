@@ -0,0 +1,53 @@
+import importlib
+
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def migration(tmp_path, monkeypatch):
+    """Module de migration importé hors du projet (il crée auth_migrated.db dans le répertoire courant)."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("DJANGO_DATABASE_URL", f"sqlite:///{tmp_path}/django.db")
+    return importlib.import_module("migrate_django_to_fastapi")
+
+
+def test_new_login_attempts_with_existing_rows(migration):
+    """Dates Django avec fuseau comparées aux dates SQLite sans fuseau."""
+    attempts_df = pd.DataFrame({
+        "email": ["a@dip.com", "a@dip.com", "b@dip.com"],
+        "success": [True, False, True],
+        "attempted_at": pd.to_datetime(
+            ["2024-01-01 10:00", "2024-01-02 10:00", "2024-01-01 10:00"]
+        ).tz_localize("UTC"),
+    })
+    existing_df = pd.DataFrame({
+        "email": ["a@dip.com"],
+        "attempted_at": pd.to_datetime(["2024-01-01 10:00"]),
+    })
+
+    new_df = migration._new_login_attempts(attempts_df, existing_df)
+
+    assert new_df["email"].tolist() == ["a@dip.com", "b@dip.com"]
+    assert new_df["attempted_at"].dt.tz is None
+
+
+def test_new_login_attempts_without_existing_rows(migration):
+    """Sans tentative migrée, toutes les tentatives Django sont reprises."""
+    attempts_df = pd.DataFrame({
+        "email": ["a@dip.com"],
+        "attempted_at": pd.to_datetime(["2024-01-01 10:00"]).tz_localize("UTC"),
+    })
+    existing_df = pd.DataFrame(columns=["email", "attempted_at"])
+
+    assert len(migration._new_login_attempts(attempts_df, existing_df)) == 1
+
+
+def test_login_attempt_records_keep_integer_user_ids(migration):
+    """user_id manquant : None, les autres restent des entiers."""
+    attempts_df = pd.DataFrame({"user_id": [1.0, None], "email": ["a@dip.com", "x@dip.com"]})
+
+    records = migration._login_attempt_records(attempts_df)
+
+    assert records == [{"user_id": 1, "email": "a@dip.com"}, {"user_id": None, "email": "x@dip.com"}]
+    assert type(records[0]["user_id"]) is int
@@ -0,0 +1,70 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from api.db import get_session
+from api.main import create_app
+from api.models import UploadedFile
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Client de test de l'API ETL (bases temporaires de conftest.py)."""
+    with TestClient(create_app()) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def file_id(client):
+    """Fichier CSV uploadé par l'API."""
+    upload = client.post("/upload", files={"file": ("process.csv", b"a,b\n1,2\n3,4\n", "text/csv")})
+    assert upload.status_code == 200
+    return upload.json()["file_id"]
+
+
+def test_process_uploaded_file(client, file_id):
+    """Un fichier uploadé est traité à partir de son identifiant."""
+    response = client.post("/process", json={"file_id": file_id, "config": {}})
+
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert result["original_shape"] == [2, 2]
+    assert result["output_format"] == "csv"
+    assert result["output_path"].endswith(".csv")
+
+
+def test_process_parquet_output(client, file_id):
+    """La sortie Parquet est demandée explicitement dans la configuration."""
+    response = client.post("/process", json={"file_id": file_id, "config": {"output_format": "parquet"}})
+
+    assert response.status_code == 200, response.text
+    assert response.json()["output_path"].endswith(".parquet")
+    assert client.post("/process", json={"file_id": file_id, "config": {"output_format": "xml"}}).status_code == 400
+
+
+def test_process_unknown_config_column(client, file_id):
+    """Une configuration qui cite une colonne absente est une erreur du client."""
+    response = client.post("/process", json={"file_id": file_id, "config": {"group_by": "absente"}})
+
+    assert response.status_code == 400
+    assert "absente" in response.json()["detail"]
+
+
+def test_process_rejects_file_path(client):
+    """Un chemin arbitraire du serveur n'est plus accepté."""
+    response = client.post("/process", json={"file_path": "/etc/passwd"})
+
+    assert response.status_code == 422
+
+
+def test_process_unknown_file(client):
+    """Un identifiant inconnu renvoie 404."""
+    assert client.post("/process", json={"file_id": 999999}).status_code == 404
+
+
+def test_process_outside_upload_dir(client, file_id):
+    """Un fichier enregistré hors du répertoire d'upload est refusé."""
+    with get_session() as session:
+        session.get(UploadedFile, file_id).stored_path = "/etc/passwd"
+        session.commit()
+
+    assert client.post("/process", json={"file_id": file_id}).status_code == 400
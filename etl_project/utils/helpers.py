@@ -2,17 +2,36 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Union, Any
 from loguru import logger
-import json
+import orjson
 import os
+import copy
+from collections import OrderedDict
 from datetime import datetime
 
+BYTES_PER_MB = 1024 * 1024
+
+
+PROFILE_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _profile_json_default(obj):
+    """Types non gérés par orjson : les Series ne sont converties qu'ici."""
+    if isinstance(obj, pd.Series):
+        return obj.to_dict()
+    return str(obj)
+
 
 class DataProfiler:
     """Classe pour le profilage et la validation des données."""
     
+    # Nombre maximal de profils de colonnes gardés en cache (LRU)
+    COLUMN_CACHE_SIZE = 512
+    
     def __init__(self):
         self.logger = logger
         self.profile_stats = {}
+        # Cache LRU des profils de colonnes, clé: (nom, dtype, longueur, empreinte)
+        self._col_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
     
     def profile_dataframe(self, df: pd.DataFrame, detailed: bool = True) -> Dict[str, Any]:
         """
@@ -27,20 +46,29 @@ class DataProfiler:
         """
         self.logger.info("Début du profilage des données")
         
+        # Comptages partagés par les sous-profils (une seule passe chacun)
+        null_counts = df.isnull().sum()
+        unique_counts = df.nunique()
+        # memory_usage(deep=True) mesure chaque chaîne : calculé une seule fois
+        memory_usage = df.memory_usage(deep=True)
+        # Profils de colonnes d'abord : leurs agrégats alimentent le résumé statistique
+        column_profiles = (self._get_column_profiles(df, null_counts, unique_counts)
+                           if detailed else None)
+        
         profile = {
-            'basic_info': self._get_basic_info(df),
-            'data_types': self._get_data_types_info(df),
-            'missing_values': self._get_missing_values_info(df),
+            'basic_info': self._get_basic_info(df, memory_usage),
+            'data_types': self._get_data_types_info(df, null_counts, unique_counts),
+            'missing_values': self._get_missing_values_info(df, null_counts),
             'duplicates': self._get_duplicates_info(df),
-            'statistical_summary': self._get_statistical_summary(df),
+            'statistical_summary': self._get_statistical_summary(df, column_profiles),
             'timestamp': datetime.now().isoformat()
         }
         
         if detailed:
             profile.update({
-                'column_profiles': self._get_column_profiles(df),
-                'data_quality': self._get_data_quality_metrics(df),
-                'memory_usage': self._get_memory_usage(df)
+                'column_profiles': column_profiles,
+                'data_quality': self._get_data_quality_metrics(df, null_counts),
+                'memory_usage': self._get_memory_usage(df, memory_usage)
             })
         
         self.profile_stats['last_profile'] = profile
@@ -48,26 +76,32 @@ class DataProfiler:
         
         return profile
     
-    def _get_basic_info(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _get_basic_info(self, df: pd.DataFrame,
+                        memory_usage: Optional[pd.Series] = None) -> Dict[str, Any]:
         """Informations de base sur le DataFrame."""
+        memory_usage = df.memory_usage(deep=True) if memory_usage is None else memory_usage
         return {
             'rows': len(df),
             'columns': len(df.columns),
-            'memory_usage_mb': df.memory_usage(deep=True).sum() / 1024 / 1024,
+            'memory_usage_mb': memory_usage.sum() / BYTES_PER_MB,
             'shape': df.shape,
             'column_names': list(df.columns)
         }
     
-    def _get_data_types_info(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _get_data_types_info(self, df: pd.DataFrame,
+                             null_counts: Optional[pd.Series] = None,
+                             unique_counts: Optional[pd.Series] = None) -> Dict[str, Any]:
         """Informations sur les types de données."""
-        dtype_counts = df.dtypes.value_counts().to_dict()
+        null_counts = df.isnull().sum() if null_counts is None else null_counts
+        unique_counts = df.nunique() if unique_counts is None else unique_counts
+        dtype_counts = df.dtypes.astype(str).value_counts().to_dict()
         dtype_details = {}
         
-        for col in df.columns:
+        for col, dtype in df.dtypes.items():
             dtype_details[col] = {
-                'dtype': str(df[col].dtype),
-                'unique_count': df[col].nunique(),
-                'null_count': df[col].isnull().sum()
+                'dtype': str(dtype),
+                'unique_count': int(unique_counts[col]),
+                'null_count': null_counts[col]
             }
         
         return {
@@ -75,15 +109,17 @@ class DataProfiler:
             'dtype_details': dtype_details
         }
     
-    def _get_missing_values_info(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _get_missing_values_info(self, df: pd.DataFrame,
+                                 null_counts: Optional[pd.Series] = None) -> Dict[str, Any]:
         """Informations sur les valeurs manquantes."""
-        missing_counts = df.isnull().sum()
+        missing_counts = df.isnull().sum() if null_counts is None else null_counts
         missing_percentages = (missing_counts / len(df)) * 100
         
         return {
             'total_missing': missing_counts.sum(),
-            'missing_by_column': missing_counts.to_dict(),
-            'missing_percentages': missing_percentages.to_dict(),
+            # Series conservées telles quelles, converties à la sérialisation
+            'missing_by_column': missing_counts,
+            'missing_percentages': missing_percentages,
             'columns_with_missing': missing_counts[missing_counts > 0].index.tolist()
         }
     
@@ -97,55 +133,119 @@ class DataProfiler:
             'has_duplicates': duplicate_count > 0
         }
     
-    def _get_statistical_summary(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _get_statistical_summary(self, df: pd.DataFrame,
+                                 column_profiles: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Résumé statistique des colonnes numériques."""
         numeric_cols = df.select_dtypes(include=[np.number]).columns
         
         if len(numeric_cols) == 0:
             return {'numeric_columns': 0, 'summary': {}}
         
-        summary = df[numeric_cols].describe().to_dict()
+        # Colonnes déjà agrégées par _get_column_profiles : pas de nouveau describe()
+        column_profiles = column_profiles or {}
+        profiled = [col for col in numeric_cols if 'mean' in column_profiles.get(col, {})]
+        remaining = [col for col in numeric_cols if col not in profiled]
+        described = df[remaining].describe().to_dict() if remaining else {}
+        
+        summary = {}
+        for col in numeric_cols:
+            if col not in profiled:
+                summary[col] = described[col]
+                continue
+            col_profile = column_profiles[col]
+            summary[col] = {
+                'count': float(len(df) - col_profile['null_count']),
+                'mean': float(col_profile['mean']),
+                'std': float(col_profile['std']),
+                'min': float(col_profile['min']),
+                '25%': float(col_profile['q25']),
+                '50%': float(col_profile['median']),
+                '75%': float(col_profile['q75']),
+                'max': float(col_profile['max'])
+            }
         
         return {
             'numeric_columns': len(numeric_cols),
             'summary': summary
         }
     
-    def _get_column_profiles(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _column_cache_key(self, series: pd.Series) -> Optional[tuple]:
+        """Clé de cache d'une colonne (None si les valeurs ne sont pas hachables)."""
+        try:
+            digest = int(pd.util.hash_pandas_object(series, index=False).values.sum())
+        except TypeError:
+            return None
+        return (series.name, str(series.dtype), len(series), digest)
+    
+    def _get_column_profiles(self, df: pd.DataFrame,
+                             null_counts: Optional[pd.Series] = None,
+                             unique_counts: Optional[pd.Series] = None) -> Dict[str, Any]:
         """Profils détaillés par colonne."""
         column_profiles = {}
         
+        # Colonnes absentes du cache, profilées ensemble
+        keys = {col: self._column_cache_key(df[col]) for col in df.columns}
+        pending = [col for col in df.columns
+                   if keys[col] is None or keys[col] not in self._col_cache]
+        
+        if pending:
+            if null_counts is None:
+                null_counts = df[pending].isnull().sum()
+            if unique_counts is None:
+                unique_counts = df[pending].nunique()
+            numeric_cols = [col for col in pending if df[col].dtype in ['int64', 'float64']]
+            if numeric_cols:
+                # Deux passes vectorisées au lieu de 7 réductions par colonne
+                stats = df[numeric_cols].agg(['min', 'max', 'mean', 'median', 'std'])
+                quantiles = df[numeric_cols].quantile([0.25, 0.75])
+        
         for col in df.columns:
+            key = keys[col]
+            if col not in pending:
+                # Copie profonde : top_values n'est pas partagé avec le cache
+                self._col_cache.move_to_end(key)
+                column_profiles[col] = copy.deepcopy(self._col_cache[key])
+                continue
+            
             col_profile = {
                 'dtype': str(df[col].dtype),
-                'unique_count': df[col].nunique(),
-                'null_count': df[col].isnull().sum(),
-                'null_percentage': (df[col].isnull().sum() / len(df)) * 100
+                'unique_count': int(unique_counts[col]),
+                'null_count': null_counts[col],
+                'null_percentage': (null_counts[col] / len(df)) * 100
             }
             
             # Informations spécifiques selon le type de données
-            if df[col].dtype in ['int64', 'float64']:
+            if col in numeric_cols:
+                # min/max gardent le type de la colonne (agg les passe en float)
+                cast = df[col].dtype.type
                 col_profile.update({
-                    'min': df[col].min(),
-                    'max': df[col].max(),
-                    'mean': df[col].mean(),
-                    'median': df[col].median(),
-                    'std': df[col].std(),
-                    'q25': df[col].quantile(0.25),
-                    'q75': df[col].quantile(0.75)
+                    'min': cast(stats.at['min', col]),
+                    'max': cast(stats.at['max', col]),
+                    'mean': stats.at['mean', col],
+                    'median': stats.at['median', col],
+                    'std': stats.at['std', col],
+                    'q25': quantiles.at[0.25, col],
+                    'q75': quantiles.at[0.75, col]
                 })
             elif df[col].dtype == 'object':
+                value_counts = df[col].value_counts()
                 col_profile.update({
-                    'top_values': df[col].value_counts().head(5).to_dict(),
-                    'value_counts': len(df[col].value_counts())
+                    'top_values': value_counts.head(5).to_dict(),
+                    'value_counts': len(value_counts)
                 })
             
+            if key is not None:
+                self._col_cache[key] = copy.deepcopy(col_profile)
+                if len(self._col_cache) > self.COLUMN_CACHE_SIZE:
+                    self._col_cache.popitem(last=False)
             column_profiles[col] = col_profile
         
         return column_profiles
     
-    def _get_data_quality_metrics(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _get_data_quality_metrics(self, df: pd.DataFrame,
+                                  null_counts: Optional[pd.Series] = None) -> Dict[str, Any]:
         """Métriques de qualité des données."""
+        null_counts = df.isnull().sum() if null_counts is None else null_counts
         quality_metrics = {
             'completeness': {},
             'consistency': {},
@@ -153,33 +253,35 @@ class DataProfiler:
         }
         
         # Complétude
-        for col in df.columns:
-            completeness = (len(df) - df[col].isnull().sum()) / len(df) * 100
-            quality_metrics['completeness'][col] = completeness
+        quality_metrics['completeness'] = ((len(df) - null_counts) / len(df) * 100).to_dict()
         
         # Cohérence (pour les colonnes numériques)
         numeric_cols = df.select_dtypes(include=[np.number]).columns
-        for col in numeric_cols:
-            # Vérification des valeurs aberrantes avec IQR
-            Q1 = df[col].quantile(0.25)
-            Q3 = df[col].quantile(0.75)
+        if len(numeric_cols) > 0:
+            # Valeurs aberrantes (IQR) : un seul calcul de quantiles et un seul masque
+            numeric = df[numeric_cols]
+            quantiles = numeric.quantile([0.25, 0.75])
+            Q1, Q3 = quantiles.loc[0.25], quantiles.loc[0.75]
             IQR = Q3 - Q1
-            outliers = ((df[col] < (Q1 - 1.5 * IQR)) | (df[col] > (Q3 + 1.5 * IQR))).sum()
-            quality_metrics['consistency'][col] = {
-                'outliers_count': outliers,
-                'outliers_percentage': (outliers / len(df)) * 100
-            }
+            outlier_counts = (numeric.lt(Q1 - 1.5 * IQR) | numeric.gt(Q3 + 1.5 * IQR)).sum()
+            for col in numeric_cols:
+                quality_metrics['consistency'][col] = {
+                    'outliers_count': outlier_counts[col],
+                    'outliers_percentage': (outlier_counts[col] / len(df)) * 100
+                }
         
         return quality_metrics
     
-    def _get_memory_usage(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _get_memory_usage(self, df: pd.DataFrame,
+                          memory_usage: Optional[pd.Series] = None) -> Dict[str, Any]:
         """Informations sur l'utilisation mémoire."""
-        memory_usage = df.memory_usage(deep=True)
+        memory_usage = df.memory_usage(deep=True) if memory_usage is None else memory_usage
+        total_memory = memory_usage.sum()
         
         return {
-            'total_memory_mb': memory_usage.sum() / 1024 / 1024,
-            'memory_by_column': (memory_usage / 1024 / 1024).to_dict(),
-            'memory_efficiency': memory_usage.sum() / (len(df) * len(df.columns))
+            'total_memory_mb': total_memory / BYTES_PER_MB,
+            'memory_by_column': memory_usage / BYTES_PER_MB,
+            'memory_efficiency': total_memory / (len(df) * len(df.columns))
         }
     
     def save_profile(self, profile: Dict[str, Any], filepath: str):
@@ -191,8 +293,9 @@ class DataProfiler:
             filepath (str): Chemin du fichier de sauvegarde
         """
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(profile, f, indent=2, default=str)
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(profile, default=_profile_json_default,
+                                     option=PROFILE_JSON_OPTIONS))
             
             self.logger.info(f"Profil sauvegardé dans {filepath}")
             
@@ -210,8 +313,8 @@ class DataProfiler:
             Dict[str, Any]: Profil chargé
         """
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                profile = json.load(f)
+            with open(filepath, 'rb') as f:
+                profile = orjson.loads(f.read())
             
             self.logger.info(f"Profil chargé depuis {filepath}")
             return profile
@@ -1,4 +1,5 @@
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from sqlalchemy import create_engine
 
 # === Connexion PostgreSQL ===
@@ -7,21 +8,32 @@ PASSWORD = "admin"
 HOST = "localhost"
 PORT = "5432"
 DBNAME = "ma_base_dip"
-engine = create_engine(f"postgresql+psycopg2://{USER}:{PASSWORD}@{HOST}:{PORT}/{DBNAME}")
+# Une connexion par thread de chargement ; executemany psycopg2 en lots (execute_values)
+MAX_WORKERS = 8
+engine = create_engine(
+    f"postgresql+psycopg2://{USER}:{PASSWORD}@{HOST}:{PORT}/{DBNAME}",
+    pool_size=MAX_WORKERS,
+    max_overflow=0,
+    executemany_mode="values_plus_batch"
+)
+
+# === Caractères remplacés/supprimés dans les noms de colonnes (une seule passe) ===
+_SANITIZE = str.maketrans({" ": "_", "'": "", "(": "", ")": "", ",": "", ";": ""})
 
 # === Fonction pour rendre les colonnes uniques et compatibles Postgres ===
 def make_unique_columns(columns):
+    # Nettoyage basique, puis troncature si trop long
+    # (Postgres limite à 63, mais on garde plus de place : limite étendue à 150 caractères)
+    cols = [str(col).strip().translate(_SANITIZE)[:150] for col in columns]
+    
+    # Cas courant : aucun doublon, rien à renommer
+    if len(set(cols)) == len(cols):
+        return cols
+    
+    # Gérer doublons
     seen = {}
     new_cols = []
-    for col in columns:
-        # Nettoyage basique
-        col = str(col).strip().replace(" ", "_").replace("'", "")
-        col = col.replace("(", "").replace(")", "").replace(",", "").replace(";", "")
-        
-        # Tronquer si trop long (Postgres limite à 63, mais on garde plus de place)
-        col = col[:150]  # limite étendue à 150 caractères
-        
-        # Gérer doublons
+    for col in cols:
         if col in seen:
             seen[col] += 1
             col = f"{col}_{seen[col]}"
@@ -31,13 +43,19 @@ def make_unique_columns(columns):
     return new_cols
 
 # === Charger Excel ===
+# Toutes les feuilles en une seule lecture du classeur (moteur calamine : python-calamine)
 fichier_excel = "20250731_Data_UEMOA COMPLET_0.xlsx"
-xls = pd.ExcelFile(fichier_excel)
-print("Feuilles détectées :", xls.sheet_names)
+feuilles = pd.read_excel(fichier_excel, sheet_name=None, engine="calamine")
+print("Feuilles détectées :", list(feuilles))
+
+# === Export d'une feuille vers PostgreSQL (exécuté dans un thread) ===
+def charger_table(nom_table, df):
+    df.to_sql(nom_table, engine, if_exists="replace", index=False, chunksize=10000)
+    print(f"✅ Données insérées dans la table : {nom_table}")
 
-for sheet_name in xls.sheet_names:
-    print(f"📥 Lecture de la feuille : {sheet_name}")
-    df = pd.read_excel(fichier_excel, sheet_name=sheet_name)
+tables = []
+for sheet_name, df in feuilles.items():
+    print(f"📥 Traitement de la feuille : {sheet_name}")
 
     # Appliquer la fonction
     old_cols = df.columns.tolist()
@@ -47,9 +65,15 @@ for sheet_name in xls.sheet_names:
         if old != new:
             print(f"   {old}  ➝  {new}")
 
-    # Export vers PostgreSQL
+    # Nom de la table PostgreSQL
     nom_table = sheet_name.strip().replace(" ", "_").lower()
     # Tronquer le nom de table si trop long (limite à 150 caractères)
     nom_table = nom_table[:150]
-    df.to_sql(nom_table, engine, if_exists="replace", index=False)
-    print(f"✅ Données insérées dans la table : {nom_table}")
+    tables.append((nom_table, df))
+
+# === Export vers PostgreSQL : les feuilles sont chargées en parallèle ===
+# (le GIL est relâché pendant les échanges réseau de psycopg2)
+with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+    futures = [executor.submit(charger_table, nom_table, df) for nom_table, df in tables]
+    for future in futures:
+        future.result()
@@ -3,11 +3,18 @@
 Script de test pour vérifier l'intégration complète
 """
 
-import requests
-import json
-import time
+import asyncio
+import io
 
-def test_integration():
+import httpx
+import orjson
+
+from create_test_data import test_csv_bytes
+
+# Script autonome (python test_integration.py) : pas de collecte par pytest
+__test__ = False
+
+async def test_integration():
     """Test de l'intégration complète"""
     
     # URL de l'API ETL
@@ -15,72 +22,83 @@ def test_integration():
     
     print("🧪 Test de l'intégration complète...")
     
-    # 1. Vérifier que l'API ETL est accessible
-    try:
-        response = requests.get(f"{base_url}/files")
-        if response.status_code == 200:
-            print("✅ API ETL accessible")
-            files = response.json()
-            if files.get('items'):
-                file_id = files['items'][0]['id']
-                print(f"📁 Fichier de test trouvé: ID {file_id}")
+    # Un seul client (connexion réutilisée) pour la chaîne fichiers -> transformation
+    async with httpx.AsyncClient(base_url=base_url, http2=True, timeout=60.0) as client:
+        # 1. Vérifier que l'API ETL est accessible
+        try:
+            response = await client.get("/files")
+            if response.status_code == 200:
+                print("✅ API ETL accessible")
+                files = orjson.loads(response.content)
+                if not files.get('items'):
+                    # Aucun fichier : upload des données de test (CSV mémorisé, sans fichier temporaire)
+                    upload_response = await client.post(
+                        "/upload",
+                        files={'file': ('test_data.csv', io.BytesIO(test_csv_bytes()), 'text/csv')}
+                    )
+                    if upload_response.status_code == 200:
+                        files['items'] = [{'id': orjson.loads(upload_response.content)['file_id']}]
+                        print("📤 Données de test uploadées")
+                if files.get('items'):
+                    file_id = files['items'][0]['id']
+                    print(f"📁 Fichier de test trouvé: ID {file_id}")
                 
-                # 2. Tester l'endpoint de transformation
-                transform_config = {
-                    "processing_mode": "hybrid",
-                    "missing_strategy": "mean",
-                    "handle_outliers": True,
-                    "outliers_method": "winsorize",
-                    "outlier_detection": "iqr",
-                    "remove_duplicates": True,
-                    "fix_inconsistencies": True,
-                    "normalize_numerical": True,
-                    "numerical_method": "standard",
-                    "encode_categorical": True,
-                    "categorical_method": "label",
-                    "normalize_dates": True,
-                    "extract_date_features": True
-                }
+                    # 2. Tester l'endpoint de transformation
+                    transform_config = {
+                        "processing_mode": "hybrid",
+                        "missing_strategy": "mean",
+                        "handle_outliers": True,
+                        "outliers_method": "winsorize",
+                        "outlier_detection": "iqr",
+                        "remove_duplicates": True,
+                        "fix_inconsistencies": True,
+                        "normalize_numerical": True,
+                        "numerical_method": "standard",
+                        "encode_categorical": True,
+                        "categorical_method": "label",
+                        "normalize_dates": True,
+                        "extract_date_features": True
+                    }
                 
-                print("🔄 Test de la transformation...")
-                transform_response = requests.post(
-                    f"{base_url}/files/{file_id}/transform",
-                    json={"options": transform_config},
-                    headers={"Content-Type": "application/json"}
-                )
+                    print("🔄 Test de la transformation...")
+                    transform_response = await client.post(
+                        f"/files/{file_id}/transform",
+                        content=orjson.dumps({"options": transform_config}),
+                        headers={"Content-Type": "application/json"}
+                    )
                 
-                if transform_response.status_code == 200:
-                    result = transform_response.json()
-                    print("✅ Transformation réussie!")
-                    print(f"📊 Résultats:")
-                    print(f"   - Shape original: {result['original_shape']}")
-                    print(f"   - Shape traité: {result['processed_shape']}")
-                    print(f"   - Outliers détectés: {result['summary']['outliers_detected']}")
-                    print(f"   - Mode de traitement: {result['summary']['processing_mode']}")
-                    print(f"   - Fichier de sortie: {result['output_path']}")
+                    if transform_response.status_code == 200:
+                        result = orjson.loads(transform_response.content)
+                        print("✅ Transformation réussie!")
+                        print(f"📊 Résultats:")
+                        print(f"   - Shape original: {result['original_shape']}")
+                        print(f"   - Shape traité: {result['processed_shape']}")
+                        print(f"   - Outliers détectés: {result['summary']['outliers_detected']}")
+                        print(f"   - Mode de traitement: {result['summary']['processing_mode']}")
+                        print(f"   - Fichier de sortie: {result['output_path']}")
                     
-                    return True
+                        return True
+                    else:
+                        print(f"❌ Erreur de transformation: {transform_response.status_code}")
+                        print(f"   Détails: {transform_response.text}")
+                        return False
                 else:
-                    print(f"❌ Erreur de transformation: {transform_response.status_code}")
-                    print(f"   Détails: {transform_response.text}")
+                    print("⚠️  Aucun fichier trouvé pour le test")
                     return False
             else:
-                print("⚠️  Aucun fichier trouvé pour le test")
+                print(f"❌ API ETL non accessible: {response.status_code}")
                 return False
-        else:
-            print(f"❌ API ETL non accessible: {response.status_code}")
-            return False
             
-    except requests.exceptions.ConnectionError:
-        print("❌ Impossible de se connecter à l'API ETL")
-        print("   Assurez-vous que l'API ETL est démarrée sur le port 8000")
-        return False
-    except Exception as e:
-        print(f"❌ Erreur inattendue: {e}")
-        return False
+        except httpx.ConnectError:
+            print("❌ Impossible de se connecter à l'API ETL")
+            print("   Assurez-vous que l'API ETL est démarrée sur le port 8000")
+            return False
+        except Exception as e:
+            print(f"❌ Erreur inattendue: {e}")
+            return False
 
 if __name__ == "__main__":
-    success = test_integration()
+    success = asyncio.run(test_integration())
     if success:
         print("\n🎉 Test d'intégration réussi!")
         print("   Votre système de traitement automatique est opérationnel!")